@@ -1,15 +1,19 @@
-import random
 from turtle import color
 from typing import Optional
 
+import numpy as np
 import tcod
 from console_game_engine import entity_factories
 
+from console_game_engine.camera import Camera
 from console_game_engine.colors import colors
 from console_game_engine.engine import Engine
 from console_game_engine.entity import Entity
 from console_game_engine.game_map import GameMap
 from console_game_engine.input_handlers import EventHandler
+from procedural_generator.chunked_world import ChunkedWorld
+from procedural_generator.dungeon_cache import DungeonCache
+from procedural_generator.generation_strategies import get_strategy
 
 
 class Configurations:
@@ -29,6 +33,11 @@ class Configurations:
         title: str = "Sidith's Roguelike",
         player_entity: Optional[Entity] = None,
         fov_algorithm=tcod.FOV_PERMISSIVE_4,
+        seed: Optional[int] = None,
+        dungeon_cache_dir: Optional[str] = None,
+        generation_strategy: str = "longest_path_in_mst",
+        chunked_world: bool = False,
+        chunk_size: int = 32,
     ):
         """
         Initialize the configuration parameters.
@@ -47,6 +56,11 @@ class Configurations:
             flags: The flags to use for the game window.
             title: The title of the game window.
             player_entity: The player Entity object.
+            seed: Seed for the random number generator used to build the dungeon.  The same seed and parameters always give the same dungeon.
+            dungeon_cache_dir: Directory for the on-disk tier of the dungeon cache.  Seeded dungeons are always cached in memory.
+            generation_strategy: Name of the dungeon generation strategy, one of generation_strategies.STRATEGIES.
+            chunked_world: Play in an unbounded ChunkedWorld that the screen scrolls over instead of a single generated dungeon.
+            chunk_size: The width and height of a chunk of the chunked world in tiles.
         """
         # Screen parameters
         self.tileset = tcod.tileset.load_tilesheet(
@@ -62,6 +76,9 @@ class Configurations:
         self.default_room_min_size = default_room_min_size
         self.default_room_max_size = default_room_max_size
         self.default_max_rooms = default_max_rooms
+        # Looked up now so that a misspelt name fails before the window opens
+        get_strategy(generation_strategy)
+        self.generation_strategy = generation_strategy
 
         self.event_handler = EventHandler()
 
@@ -71,11 +88,29 @@ class Configurations:
 
         self.fov_algorithm = fov_algorithm
 
+        # Random number generator shared by the whole generation pipeline
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.dungeon_cache = DungeonCache(directory=dungeon_cache_dir)
+
+        # The game map is a view of the chunked world, and the player starts
+        # in the hub room of the chunk at the world's origin
+        self.chunked_world = chunked_world
+        self.camera = None
+        if chunked_world:
+            world_seed = seed if seed is not None else int(self.rng.integers(2**32))
+            world = ChunkedWorld(world_seed, chunk_size=chunk_size)
+            self.camera = Camera(world, self.game_map)
+            hub_x, hub_y = world.chunk(0, 0).rooms.centers[0]
+            self.camera.center_on(int(hub_x), int(hub_y))
+            start_x, start_y = self.camera.to_view(int(hub_x), int(hub_y))
+        else:
+            start_x = int(self.rng.integers(0, self.map_width))
+            start_y = int(self.rng.integers(0, self.map_height))
+
         # Player
         self.player_entity = player_entity or entity_factories.player.spawn(
-            gamemap=self.game_map,
-            x=random.randint(0, self.map_width - 1),
-            y=random.randint(0, self.map_height - 1),
+            gamemap=self.game_map, x=start_x, y=start_y
         )
 
         self.engine = Engine(
@@ -83,6 +118,9 @@ class Configurations:
             game_map=self.game_map,
             player=self.player_entity,
             fov_algorithm=self.fov_algorithm,
+            rng=self.rng,
+            dungeon_cache=self.dungeon_cache,
+            camera=self.camera,
         )
 
         # Game window parameters
@@ -104,6 +142,9 @@ class Configurations:
             f"      default_room_min_size: {self.default_room_min_size}\n"
             f"      default_room_max_size: {self.default_room_max_size}\n"
             f"      default_max_rooms: {self.default_max_rooms}\n"
+            f"      seed: {self.seed}\n"
+            f"      generation_strategy: {self.generation_strategy}\n"
+            f"      chunked_world: {self.chunked_world}\n"
             f"    Player and NPC entities:\n"
             f"      player_entity: {self.player_entity}\n"
             f"    Event handler and engine:\n"
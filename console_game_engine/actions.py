@@ -1,5 +1,5 @@
 from __future__ import annotations
-import logging
+import logging.config
 import random
 
 from typing import TYPE_CHECKING
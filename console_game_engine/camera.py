@@ -0,0 +1,65 @@
+# camera.py
+# Keeps a screen sized GameMap showing the part of a ChunkedWorld around the
+# player.  Entities on the map are in view coordinates; the camera's origin is
+# the world position of the view's top left cell, and the view is recentered on
+# the player whenever they come within margin cells of its edge.
+from typing import Optional
+
+from console_game_engine.entity import Entity
+from console_game_engine.game_map import GameMap
+from procedural_generator.chunked_world import ChunkedWorld
+
+
+class Camera:
+    """
+    View of a ChunkedWorld through game_map.  Recentering writes what was explored in the old view back to the chunks, generates every chunk within a view's width of the player so the next few steps never wait on generation, loads the new view, and moves every entity on the map by the shift of the origin so they keep their world positions.
+    """
+
+    def __init__(
+        self, world: ChunkedWorld, game_map: GameMap, margin: Optional[int] = None
+    ) -> None:
+        self.world = world
+        self.game_map = game_map
+        self.margin = (
+            margin if margin is not None else min(game_map.width, game_map.height) // 4
+        )
+        self.origin_x = self.origin_y = 0
+        self.loaded = False
+
+    def to_world(self, x: int, y: int) -> tuple[int, int]:
+        return x + self.origin_x, y + self.origin_y
+
+    def to_view(self, world_x: int, world_y: int) -> tuple[int, int]:
+        return world_x - self.origin_x, world_y - self.origin_y
+
+    def center_on(self, world_x: int, world_y: int) -> None:
+        """Loads the view with (world_x, world_y) in its middle, storing the old view first."""
+        game_map = self.game_map
+        old_x, old_y = self.origin_x, self.origin_y
+        if self.loaded:
+            self.world.store_view(game_map, old_x, old_y)
+        self.world.ensure_loaded_around(
+            world_x, world_y, max(game_map.width, game_map.height)
+        )
+        self.origin_x = world_x - game_map.width // 2
+        self.origin_y = world_y - game_map.height // 2
+        self.world.load_view(game_map, self.origin_x, self.origin_y)
+        self.loaded = True
+
+        dx, dy = old_x - self.origin_x, old_y - self.origin_y
+        if dx or dy:
+            for entity in list(game_map.entities):
+                game_map.move_entity(
+                    entity, entity.transform.x + dx, entity.transform.y + dy
+                )
+
+    def follow(self, entity: Entity) -> bool:
+        """Recenters the view on entity when it is within margin cells of an edge, and returns whether it did."""
+        x, y = entity.transform.x, entity.transform.y
+        if (
+            self.margin <= x < self.game_map.width - self.margin
+            and self.margin <= y < self.game_map.height - self.margin
+        ):
+            return False
+        self.center_on(*self.to_world(x, y))
+        return True
@@ -1,13 +1,16 @@
-from typing import Any, Iterable
+from typing import Any, Iterable, Optional
 
+import numpy as np
 import tcod
 from tcod.console import Console
 from tcod.context import Context
-from tcod.map import compute_fov
 from console_game_engine.timers import benchmark
 
 import procedural_generator.procedural_gen as procedural_gen
+from procedural_generator.dungeon_cache import DungeonCache, generate_dungeon_cached
+from console_game_engine.camera import Camera
 from console_game_engine.entity import Entity, Transform
+from console_game_engine.fov import FOVService
 from console_game_engine.game_map import GameMap
 from console_game_engine.input_handlers import EventHandler
 
@@ -19,11 +22,20 @@ class Engine:
         game_map: GameMap,
         player: Entity,
         fov_algorithm: int,
+        rng: np.random.Generator = None,
+        dungeon_cache: Optional[DungeonCache] = None,
+        fov: Optional[FOVService] = None,
+        camera: Optional[Camera] = None,
     ) -> None:
         self.event_handler = event_handler
         self.game_map = game_map
         self.player = player
         self.fov_algorithm = fov_algorithm
+        self.rng = np.random.default_rng(rng)
+        self.dungeon_cache = dungeon_cache
+        self.fov = fov or FOVService()
+        # Set when game_map is a view of a ChunkedWorld that follows the player
+        self.camera = camera
         self.update_fov(self.player.transform, self.fov_algorithm)
 
     def game_loop(self, config, root_console: Console, context: Context):
@@ -42,20 +54,25 @@ class Engine:
                 continue
 
             action.perform(self, self.player)
+            if self.camera is not None:
+                self.camera.follow(self.player)
 
             self.update_fov(self.player.transform, self.fov_algorithm)
 
     # Update this function so that it takes in a list of entities that need to have their FOV updated.
 
     def update_fov(self, transform: Transform, fov_algorithm) -> None:
-        self.game_map.visible[:] = compute_fov(
-            self.game_map.tiles["transparent"],
-            (transform.x, transform.y),
+        # Only recomputed when the player moved or the tiles changed
+        visible = self.fov.compute(
+            self.game_map,
+            transform.x,
+            transform.y,
             radius=10,
             algorithm=fov_algorithm,
             light_walls=True,
         )
-        self.game_map.explored |= self.game_map.visible
+        self.game_map.visible[:] = visible
+        self.game_map.explored |= visible
 
     def render(self, console: Console, context: Context) -> None:
         self.game_map.render(console)
@@ -64,10 +81,38 @@ class Engine:
         console.clear()
 
     @benchmark
-    def generate_dungeon(self, max_rooms: int, min_room_size: int, max_room_size: int):
-        procedural_gen.generate_dungeon(
-            self.game_map, max_rooms, min_room_size, max_room_size, self.player
-        )
+    def generate_dungeon(
+        self,
+        max_rooms: int,
+        min_room_size: int,
+        max_room_size: int,
+        seed: Optional[int] = None,
+        strategy: str = "longest_path_in_mst",
+    ):
+        # A seeded dungeon is reproducible, so it can come from the cache
+        if seed is not None and self.dungeon_cache is not None:
+            generate_dungeon_cached(
+                self.dungeon_cache,
+                seed,
+                self.game_map,
+                max_rooms,
+                min_room_size,
+                max_room_size,
+                self.player,
+                strategy=strategy,
+            )
+        else:
+            procedural_gen.generate_dungeon(
+                self.game_map,
+                max_rooms,
+                min_room_size,
+                max_room_size,
+                self.player,
+                strategy=strategy,
+                rng=self.rng if seed is None else np.random.default_rng(seed),
+            )
+        # The new tiles bumped the map's tiles_version, so this recomputes
+        self.update_fov(self.player.transform, self.fov_algorithm)
 
     def __str__(self) -> str:
         return f"Engine(event_handler={self.event_handler}, game_map={self.game_map}, player={self.player})"
@@ -1,6 +1,5 @@
 # entity.py
 
-import copy
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, TypeVar
 
@@ -18,7 +17,24 @@ class Transform:
     y: int = 0
 
 
+@dataclass(frozen=True, slots=True)
+class EntityTemplate:
+    """
+    The parts of an entity that every copy of it shares: its name, how it is drawn and whether it blocks movement.  A template is immutable, so every entity spawned from a prototype points at the prototype's template instead of holding its own copy.
+    """
+
+    name: str
+    char: str
+    color: RGB_Color
+    blocks_movement: bool = False
+
+
 class Entity:
+    # Per instance state is only the shared template, the position and the map
+    # the entity was spawned on.  On a map the entity is a handle: its id
+    # indexes the map's EntityStore, and its transform reads the store
+    __slots__ = ("template", "transform", "gamemap", "entity_id")
+
     def __init__(
         self,
         name: str = "<Unnamed>",
@@ -27,27 +43,53 @@ class Entity:
         color_rgb: tuple[int, int, int] = None,
         blocks_movement: bool = False,
     ):
-        self.name = name
-        self.char = char
-        if color:
-            self.color = color
-        elif color_rgb:
-            self.color = RGB_Color(color_rgb)
-        else:
-            self.color = RGB_Color((255, 255, 255))
+        if not color:
+            color = RGB_Color(color_rgb) if color_rgb else RGB_Color((255, 255, 255))
+        self.template = EntityTemplate(name, char, color, blocks_movement)
         self.transform = Transform()
-        self.blocks_movement = blocks_movement
+        self.gamemap = None
+        self.entity_id = None
+
+    @classmethod
+    def from_template(
+        cls: type[T], template: EntityTemplate, x: int = 0, y: int = 0
+    ) -> T:
+        entity = cls.__new__(cls)
+        entity.template = template
+        entity.transform = Transform(x, y)
+        entity.gamemap = None
+        entity.entity_id = None
+        return entity
+
+    @property
+    def name(self) -> str:
+        return self.template.name
+
+    @property
+    def char(self) -> str:
+        return self.template.char
+
+    @property
+    def color(self) -> RGB_Color:
+        return self.template.color
+
+    @property
+    def blocks_movement(self) -> bool:
+        return self.template.blocks_movement
 
     def spawn(self: T, gamemap: "GameMap", x: int, y: int) -> T:
-        clone = copy.deepcopy(self)
-        clone.transform.x = x
-        clone.transform.y = y
-        gamemap.entities.add(clone)
+        # The clone shares this entity's template, only its position is new
+        clone = self.from_template(self.template, x, y)
+        gamemap.add_entity(clone)
         return clone
 
     def move(self, dx: int, dy: int):
-        self.transform.x += dx
-        self.transform.y += dy
+        if self.gamemap is not None:
+            # Moves the entity in the map's position index too
+            self.gamemap.move_entity(self, self.transform.x + dx, self.transform.y + dy)
+        else:
+            self.transform.x += dx
+            self.transform.y += dy
 
     def blocks_location(self, location_x: int, location_y: int) -> bool:
         test = (
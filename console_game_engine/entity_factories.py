@@ -10,3 +10,6 @@ player = Entity(
 orc = Entity(char="o", name="Orc", color=colors["teal"], blocks_movement=True)
 
 troll = Entity(char="T", name="Troll", color=colors["olive"], blocks_movement=True)
+
+# Prototypes by name, for rebuilding entities from saved spawn tables
+prototypes = {entity.name: entity for entity in (player, orc, troll)}
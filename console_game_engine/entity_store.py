@@ -0,0 +1,131 @@
+# entity_store.py
+# Component store for the entities on a GameMap.  Positions, glyphs, colors
+# and flags live in parallel numpy arrays indexed by entity id, so a system
+# that touches every entity, such as rendering or a visibility check, is a few
+# array operations instead of a loop over Python objects.  Ids of removed
+# entities go on a free list and are handed out again before the arrays grow.
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from console_game_engine.entity import Entity
+
+
+class EntityStore:
+    def __init__(self, capacity: int = 64) -> None:
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+        # Unicode code point of the glyph, as tcod consoles store it
+        self.char = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.blocks_movement = np.zeros(capacity, dtype=bool)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # The Entity handle of every live id, for going back from ids to entities
+        self.handles: list[Optional["Entity"]] = [None] * capacity
+        self._free: list[int] = list(range(capacity - 1, -1, -1))
+
+    @property
+    def capacity(self) -> int:
+        return len(self.alive)
+
+    def __len__(self) -> int:
+        return self.capacity - len(self._free)
+
+    @property
+    def ids(self) -> np.ndarray:
+        return np.flatnonzero(self.alive)
+
+    def add(self, entity: "Entity", x: int, y: int) -> int:
+        """Stores entity's components at (x, y) and returns its id."""
+        if not self._free:
+            self._grow()
+        entity_id = self._free.pop()
+
+        template = entity.template
+        self.x[entity_id] = x
+        self.y[entity_id] = y
+        self.char[entity_id] = ord(template.char)
+        self.color[entity_id] = tuple(template.color)
+        self.blocks_movement[entity_id] = template.blocks_movement
+        self.alive[entity_id] = True
+        self.handles[entity_id] = entity
+        return entity_id
+
+    def remove(self, entity_id: int) -> None:
+        if not self.alive[entity_id]:
+            raise ValueError(f"Entity id {entity_id} is not in the store.")
+        self.alive[entity_id] = False
+        self.handles[entity_id] = None
+        self._free.append(entity_id)
+
+    def entities(self, ids: np.ndarray) -> list["Entity"]:
+        return [self.handles[entity_id] for entity_id in ids.tolist()]
+
+    def visible_ids(self, visible: np.ndarray) -> np.ndarray:
+        """Ids of the live entities standing on a cell that is true in the (width, height) visible mask."""
+        ids = self._on_map(self.ids, *visible.shape)
+        return ids[visible[self.x[ids], self.y[ids]]]
+
+    def blocking_mask(self, width: int, height: int) -> np.ndarray:
+        """Boolean (width, height) mask of the cells holding a live entity that blocks movement."""
+        ids = self._on_map(
+            np.flatnonzero(self.alive & self.blocks_movement), width, height
+        )
+        mask = np.zeros((width, height), dtype=bool)
+        mask[self.x[ids], self.y[ids]] = True
+        return mask
+
+    def _on_map(self, ids: np.ndarray, width: int, height: int) -> np.ndarray:
+        # Drops the ids positioned off a width x height map, which would
+        # otherwise index the map from its far edge
+        x, y = self.x[ids], self.y[ids]
+        return ids[(0 <= x) & (x < width) & (0 <= y) & (y < height)]
+
+    def _grow(self) -> None:
+        # Doubles every array; ids keep their slots, the new ones are free
+        old = self.capacity
+        new = max(old * 2, 1)
+        for name in ("x", "y", "char", "color", "blocks_movement", "alive"):
+            array = getattr(self, name)
+            grown = np.zeros((new,) + array.shape[1:], dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self.handles.extend([None] * (new - old))
+        self._free.extend(range(new - 1, old - 1, -1))
+
+
+class StoredTransform:
+    """
+    The position of an entity that lives in an EntityStore.  It reads and writes the store's arrays, so it can stand in for the entity's Transform while the entity is on a map.
+    """
+
+    __slots__ = ("store", "entity_id")
+
+    def __init__(self, store: EntityStore, entity_id: int) -> None:
+        self.store = store
+        self.entity_id = entity_id
+
+    @property
+    def x(self) -> int:
+        return int(self.store.x[self.entity_id])
+
+    @x.setter
+    def x(self, value: int) -> None:
+        self.store.x[self.entity_id] = value
+
+    @property
+    def y(self) -> int:
+        return int(self.store.y[self.entity_id])
+
+    @y.setter
+    def y(self, value: int) -> None:
+        self.store.y[self.entity_id] = value
+
+    def __eq__(self, other) -> bool:
+        if not hasattr(other, "x") or not hasattr(other, "y"):
+            return NotImplemented
+        return (self.x, self.y) == (other.x, other.y)
+
+    def __repr__(self) -> str:
+        return f"StoredTransform(x={self.x}, y={self.y})"
@@ -0,0 +1,71 @@
+# fov.py
+# Field of view for the engine, memoized.  compute_fov walks the whole
+# transparency map, but the answer only depends on where the viewer stands
+# and on the tiles, so results are kept in a small LRU keyed by the position
+# and GameMap.tiles_version.  Standing still reuses the last result, walking
+# back over recent cells reuses older ones, and any change to the tiles, such
+# as an opened door, bumps the version so stale results are never returned.
+from collections import OrderedDict
+
+import numpy as np
+from tcod import libtcodpy
+from tcod.map import compute_fov
+
+from console_game_engine.game_map import GameMap
+
+
+class FOVService:
+    def __init__(self, max_entries: int = 32) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._game_map = None
+        self._entries: OrderedDict[tuple, np.ndarray] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def compute(
+        self,
+        game_map: GameMap,
+        x: int,
+        y: int,
+        radius: int = 10,
+        algorithm: int = libtcodpy.FOV_PERMISSIVE_4,
+        light_walls: bool = True,
+    ) -> np.ndarray:
+        """
+        The (width, height) boolean field of view from (x, y) on game_map, computed only when no cached result matches the position, the parameters and the map's tiles_version.  The returned array is read only and shared with the cache.
+        """
+        # Entries only ever describe one map; a new map starts a new cache
+        if game_map is not self._game_map:
+            self.clear()
+            self._game_map = game_map
+
+        key = (x, y, game_map.tiles_version, radius, algorithm, light_walls)
+        visible = self._entries.get(key)
+        if visible is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return visible
+
+        self.misses += 1
+        visible = compute_fov(
+            game_map.tiles["transparent"],
+            (x, y),
+            radius=radius,
+            algorithm=algorithm,
+            light_walls=light_walls,
+        )
+        visible.flags.writeable = False
+        self._entries[key] = visible
+        # Results for an older tiles_version can never be hit again
+        for stale in [k for k in self._entries if k[2] != game_map.tiles_version]:
+            del self._entries[stale]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return visible
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._game_map = None
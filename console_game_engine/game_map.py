@@ -5,9 +5,10 @@ import numpy as np
 from tcod.console import Console
 
 from console_game_engine import tile_types
-from procedural_generator.room_generation import RectangularRoom
+from procedural_generator.room_generation import RectangularRoom, rectangles_mask
 
-from console_game_engine.entity import Entity
+from console_game_engine.entity import Entity, Transform
+from console_game_engine.entity_store import EntityStore, StoredTransform
 
 
 class GameMap:
@@ -16,13 +17,60 @@ class GameMap:
         self.tiles = np.full(
             (width, height), fill_value=tile_types.tile_types["wall"], order="F"
         )
+        # Bumped by set_tiles on every change to the tiles, so anything derived
+        # from them, such as a field of view, can tell when it is stale
+        self.tiles_version = 0
         self.entities: set(Entity) = set()
+        # Components of every entity on the map, for passes over all of them
+        self.store = EntityStore()
+        # Entities by (x, y) cell, kept up to date by add_entity, remove_entity
+        # and move_entity, so position queries do not scan every entity
+        self._entities_at: dict[tuple[int, int], set[Entity]] = {}
 
         self.visible = np.full((width, height), fill_value=False, order="F")
         self.explored = np.full((width, height), fill_value=False, order="F")
 
+    def add_entity(self, entity: Entity) -> None:
+        if entity.gamemap is self:
+            return
+        if entity.gamemap is not None:
+            entity.gamemap.remove_entity(entity)
+        x, y = entity.transform.x, entity.transform.y
+        entity.gamemap = self
+        entity.entity_id = self.store.add(entity, x, y)
+        entity.transform = StoredTransform(self.store, entity.entity_id)
+        self.entities.add(entity)
+        self._entities_at.setdefault((x, y), set()).add(entity)
+
+    def remove_entity(self, entity: Entity) -> None:
+        if entity.gamemap is not self:
+            return
+        self.entities.discard(entity)
+        self._unindex(entity)
+        # Off the map the entity keeps its own copy of its position again
+        entity.transform = Transform(entity.transform.x, entity.transform.y)
+        self.store.remove(entity.entity_id)
+        entity.gamemap = None
+        entity.entity_id = None
+
+    def move_entity(self, entity: Entity, x: int, y: int) -> None:
+        self._unindex(entity)
+        entity.transform.x, entity.transform.y = x, y
+        self._entities_at.setdefault((x, y), set()).add(entity)
+
+    def _unindex(self, entity: Entity) -> None:
+        cell = (entity.transform.x, entity.transform.y)
+        here = self._entities_at.get(cell)
+        if here is not None:
+            here.discard(entity)
+            if not here:
+                del self._entities_at[cell]
+
+    def entities_at(self, x: int, y: int) -> frozenset[Entity]:
+        return frozenset(self._entities_at.get((x, y), ()))
+
     def get_blocking_entity_at_location(self, location_x, location_y):
-        for entity in self.entities:
+        for entity in self._entities_at.get((location_x, location_y), ()):
             if entity.blocks_location(location_x, location_y):
                 return entity
         return None
@@ -31,26 +79,46 @@ class GameMap:
         return 0 <= x < self.width and 0 <= y < self.height
 
     def render(self, console: Console) -> None:
-        console.tiles_rgb[0 : self.width, 0 : self.height] = np.select(
+        console.rgb[0 : self.width, 0 : self.height] = np.select(
             condlist=[self.visible, self.explored],
             choicelist=[self.tiles["light"], self.tiles["dark"]],
             default=tile_types.SHROUD,
         )
 
-        for entity in self.entities:
-            transform = entity.transform
-            if self.visible[transform.x, transform.y]:
-                console.print(
-                    x=transform.x, y=transform.y, string=entity.char, fg=entity.color
-                )
+        # Every visible entity in one pass over the store
+        ids = self.store.visible_ids(self.visible)
+        x, y = self.store.x[ids], self.store.y[ids]
+        console.rgb["ch"][x, y] = self.store.char[ids]
+        console.rgb["fg"][x, y] = self.store.color[ids]
+
+    def visible_entities(self) -> list[Entity]:
+        return self.store.entities(self.store.visible_ids(self.visible))
 
     def add_room_to_game_map(
         self, room: RectangularRoom, tile_type: str, slice_type: str
     ):
         if slice_type == "inner":
-            self.tiles[room.inner] = tile_types.tile_types[tile_type]
+            self.set_tiles(room.inner, tile_types.tile_types[tile_type])
         elif slice_type == "outer":
-            self.tiles[room.outer] = tile_types.tile_types[tile_type]
+            self.set_tiles(room.outer, tile_types.tile_types[tile_type])
+
+    def carve_rectangles(
+        self,
+        x1: np.ndarray,
+        y1: np.ndarray,
+        x2: np.ndarray,
+        y2: np.ndarray,
+        tile_type: str = "floor",
+    ) -> None:
+        # Sets every cell inside any of the half open rectangles in one write
+        mask = rectangles_mask(self.width, self.height, x1, y1, x2, y2)
+        self.set_tiles(mask, tile_types.tile_types[tile_type])
+
+    def set_tiles(self, where, tiles) -> None:
+        # Every write to the tiles goes through here to bump tiles_version;
+        # where is anything that indexes the tiles array
+        self.tiles[where] = tiles
+        self.tiles_version += 1
 
     def __str__(self) -> str:
         return f"GameMap with width {self.width} and height {self.height}"
@@ -0,0 +1,92 @@
+# camera_test.py
+
+from collections import deque
+
+import tcod.event
+from tcod import libtcodpy
+
+from console_game_engine import entity_factories, tile_types
+from console_game_engine.camera import Camera
+from console_game_engine.engine import Engine
+from console_game_engine.game_map import GameMap
+from console_game_engine.input_handlers import EventHandler
+from procedural_generator.chunked_world import FLOOR, ChunkedWorld
+
+KEYS = {
+    (1, 0): tcod.event.KeySym.RIGHT,
+    (-1, 0): tcod.event.KeySym.LEFT,
+    (0, 1): tcod.event.KeySym.DOWN,
+    (0, -1): tcod.event.KeySym.UP,
+}
+
+
+def shortest_path(floor, start, goal):
+    # Breadth first search over the floor cells, as a list of (dx, dy) steps
+    came_from = {start: None}
+    queue = deque([start])
+    while queue:
+        cell = queue.popleft()
+        if cell == goal:
+            break
+        for dx, dy in KEYS:
+            x, y = cell[0] + dx, cell[1] + dy
+            if (
+                0 <= x < floor.shape[0]
+                and 0 <= y < floor.shape[1]
+                and floor[x, y]
+                and (x, y) not in came_from
+            ):
+                came_from[(x, y)] = cell
+                queue.append((x, y))
+    steps = []
+    cell = goal
+    while came_from[cell] is not None:
+        previous = came_from[cell]
+        steps.append((cell[0] - previous[0], cell[1] - previous[1]))
+        cell = previous
+    return steps[::-1]
+
+
+def key_down(step):
+    return tcod.event.KeyDown(
+        scancode=tcod.event.Scancode.UNKNOWN,
+        sym=KEYS[step],
+        mod=tcod.event.Modifier.NONE,
+    )
+
+
+def test_player_walks_across_a_chunk_seam():
+    world = ChunkedWorld(seed=4)
+    size = world.chunk_size
+    game_map = GameMap(30, 20)
+    camera = Camera(world, game_map, margin=5)
+
+    start = tuple(int(v) for v in world.chunk(0, 0).rooms.centers[0])
+    center_x, center_y = world.chunk(1, 0).rooms.centers[0]
+    goal = (size + int(center_x), int(center_y))
+    steps = shortest_path(world.window(0, 0, 2 * size, size) == FLOOR, start, goal)
+
+    camera.center_on(*start)
+    player = entity_factories.player.spawn(game_map, *camera.to_view(*start))
+    engine = Engine(
+        EventHandler(), game_map, player, libtcodpy.FOV_PERMISSIVE_4, camera=camera
+    )
+
+    position = start
+    origins = {(camera.origin_x, camera.origin_y)}
+    for step in steps:
+        engine.handle_events([key_down(step)])
+        position = (position[0] + step[0], position[1] + step[1])
+        # Every step lands where the world says it should, in view coordinates
+        assert camera.to_world(player.transform.x, player.transform.y) == position
+        assert game_map.in_bounds(player.transform.x, player.transform.y)
+        origins.add((camera.origin_x, camera.origin_y))
+
+    assert world.chunk_coordinates(*position) == (1, 0)
+    assert len(origins) > 1
+    # The view shows the world at the camera, and the player can see around it
+    window = world.window(camera.origin_x, camera.origin_y, 30, 20)
+    assert (game_map.tiles == tile_types.decode_tiles(window)).all()
+    assert game_map.visible[player.transform.x, player.transform.y]
+    # What was explored in the views left behind was stored in the chunks
+    assert world.chunk(0, 0).explored[start]
@@ -0,0 +1,85 @@
+# entity_store_test.py
+
+import numpy as np
+import tcod
+
+from console_game_engine import entity_factories, tile_types
+from console_game_engine.entity import Entity, Transform
+from console_game_engine.entity_store import EntityStore, StoredTransform
+from console_game_engine.game_map import GameMap
+
+
+def test_entity_store_recycles_ids_and_grows():
+    store = EntityStore(capacity=2)
+    first, second, third = Entity(), Entity(), Entity()
+    ids = [store.add(entity, 0, 0) for entity in (first, second)]
+    assert ids == [0, 1]
+    assert store.add(third, 1, 1) == 2
+    assert store.capacity == 4 and len(store) == 3
+
+    store.remove(1)
+    assert store.ids.tolist() == [0, 2]
+    assert store.add(Entity(), 5, 5) == 1
+    assert len(store) == 3
+
+
+def test_spawned_entities_are_handles_into_the_map_store():
+    gamemap = GameMap(width=10, height=10)
+    orc = entity_factories.orc.spawn(gamemap, 3, 4)
+    assert isinstance(orc.transform, StoredTransform)
+    assert gamemap.store.x[orc.entity_id] == 3
+    assert gamemap.store.y[orc.entity_id] == 4
+    assert gamemap.store.char[orc.entity_id] == ord("o")
+    assert tuple(gamemap.store.color[orc.entity_id]) == tuple(orc.color)
+
+    orc.move(dx=2, dy=-1)
+    assert (gamemap.store.x[orc.entity_id], gamemap.store.y[orc.entity_id]) == (5, 3)
+    assert orc.transform == Transform(5, 3)
+
+    gamemap.remove_entity(orc)
+    assert orc.entity_id is None and len(gamemap.store) == 0
+    assert orc.transform == Transform(5, 3)
+
+
+def test_visible_entities_and_blocking_mask():
+    gamemap = GameMap(width=10, height=10)
+    player = entity_factories.player.spawn(gamemap, 1, 1)
+    orc = entity_factories.orc.spawn(gamemap, 8, 8)
+    potion = Entity(name="Potion", char="!").spawn(gamemap, 2, 1)
+    gamemap.visible[:5, :5] = True
+
+    assert set(gamemap.visible_entities()) == {player, potion}
+    blocking = gamemap.store.blocking_mask(10, 10)
+    assert blocking[1, 1] and blocking[8, 8] and not blocking[2, 1]
+    assert blocking.sum() == 2
+
+
+def test_render_draws_only_visible_entities():
+    gamemap = GameMap(width=10, height=10)
+    gamemap.tiles[:] = tile_types.floor
+    player = entity_factories.player.spawn(gamemap, 1, 1)
+    entity_factories.orc.spawn(gamemap, 8, 8)
+    gamemap.visible[:5, :5] = True
+    gamemap.explored[:] = True
+
+    console = tcod.console.Console(10, 10, order="F")
+    gamemap.render(console)
+    assert console.rgb["ch"][1, 1] == ord("@")
+    assert tuple(console.rgb["fg"][1, 1]) == tuple(player.color)
+    assert console.rgb["ch"][8, 8] != ord("o")
+    assert np.count_nonzero(console.rgb["ch"] == ord("@")) == 1
+
+
+def test_off_map_entities_are_neither_visible_nor_drawn():
+    gamemap = GameMap(width=10, height=10)
+    gamemap.tiles[:] = tile_types.floor
+    orc = entity_factories.orc.spawn(gamemap, -1, -1)
+    gamemap.visible[:] = True
+    gamemap.explored[:] = True
+
+    assert gamemap.visible_entities() == []
+    assert not gamemap.store.blocking_mask(10, 10).any()
+    console = tcod.console.Console(10, 10, order="F")
+    gamemap.render(console)
+    # -1 would otherwise wrap around to the far corner of the map
+    assert console.rgb["ch"][9, 9] != ord(orc.char)
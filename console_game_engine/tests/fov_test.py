@@ -0,0 +1,90 @@
+# fov_test.py
+
+import numpy as np
+from tcod import libtcodpy
+from tcod.map import compute_fov
+
+from console_game_engine import entity_factories, tile_types
+from console_game_engine.actions import BumpAction
+from console_game_engine.engine import Engine
+from console_game_engine.fov import FOVService
+from console_game_engine.game_map import GameMap
+from console_game_engine.input_handlers import EventHandler
+
+
+def open_map():
+    gamemap = GameMap(width=20, height=20)
+    gamemap.carve_rectangles(
+        np.array([1]), np.array([1]), np.array([19]), np.array([19])
+    )
+    return gamemap
+
+
+def test_fov_matches_compute_fov_and_is_read_only():
+    gamemap = open_map()
+    visible = FOVService().compute(gamemap, 5, 5, radius=4)
+    expected = compute_fov(
+        gamemap.tiles["transparent"],
+        (5, 5),
+        radius=4,
+        algorithm=libtcodpy.FOV_PERMISSIVE_4,
+        light_walls=True,
+    )
+    assert (visible == expected).all()
+    assert not visible.flags.writeable
+
+
+def test_fov_is_reused_for_the_same_position_and_when_backtracking():
+    gamemap = open_map()
+    fov = FOVService()
+    first = fov.compute(gamemap, 5, 5)
+    assert fov.compute(gamemap, 5, 5) is first
+    fov.compute(gamemap, 6, 5)
+    assert fov.compute(gamemap, 5, 5) is first
+    assert (fov.hits, fov.misses) == (2, 2)
+
+
+def test_changing_the_tiles_invalidates_the_fov():
+    gamemap = open_map()
+    fov = FOVService()
+    before = fov.compute(gamemap, 5, 5)
+    version = gamemap.tiles_version
+    gamemap.set_tiles((slice(6, 7), slice(0, 20)), tile_types.wall)
+    assert gamemap.tiles_version == version + 1
+
+    after = fov.compute(gamemap, 5, 5)
+    assert after is not before
+    assert not after[10, 5] and before[10, 5]
+    # Results for the old tiles are dropped rather than kept around
+    assert len(fov) == 1
+
+
+def test_fov_cache_is_bounded_and_per_map():
+    gamemap = open_map()
+    fov = FOVService(max_entries=3)
+    for x in range(2, 8):
+        fov.compute(gamemap, x, 5)
+    assert len(fov) == 3
+    fov.compute(gamemap, 7, 5)
+    assert fov.hits == 1
+
+    fov.compute(open_map(), 7, 5)
+    assert len(fov) == 1 and fov.misses == 7
+
+
+def test_engine_skips_fov_when_the_player_does_not_move():
+    gamemap = open_map()
+    player = entity_factories.player.spawn(gamemap, 1, 1)
+    engine = Engine(EventHandler(), gamemap, player, libtcodpy.FOV_PERMISSIVE_4)
+    misses = engine.fov.misses
+
+    # Bumping into the wall at (0, 1) leaves the player where it was
+    BumpAction(-1, 0).perform(engine, player)
+    engine.update_fov(player.transform, engine.fov_algorithm)
+    assert engine.fov.misses == misses
+    assert gamemap.visible[1, 1] and gamemap.explored[1, 1]
+
+    BumpAction(1, 0).perform(engine, player)
+    engine.update_fov(player.transform, engine.fov_algorithm)
+    assert engine.fov.misses == misses + 1
+    assert gamemap.visible[2, 1]
@@ -1,5 +1,7 @@
 # test_game_map.py
 
+import numpy as np
+
 from console_game_engine import tile_types
 from console_game_engine.entity import Entity
 from console_game_engine.game_map import GameMap
@@ -31,6 +33,76 @@ def test_game_map_render():
     # assert console.tiles_rgb is correctly set
 
 
+def test_game_map_carve_rectangles_matches_room_by_room_carving():
+    rooms = [
+        RectangularRoom(x=1, y=1, width=6, height=4),
+        RectangularRoom(x=5, y=2, width=4, height=7),
+        RectangularRoom(x=12, y=10, width=3, height=3),
+    ]
+    expected = GameMap(width=20, height=15)
+    for room in rooms:
+        expected.add_room_to_game_map(room=room, tile_type="floor", slice_type="inner")
+
+    gamemap = GameMap(width=20, height=15)
+    gamemap.carve_rectangles(
+        np.array([room.x1 + 1 for room in rooms]),
+        np.array([room.y1 + 1 for room in rooms]),
+        np.array([room.x2 for room in rooms]),
+        np.array([room.y2 for room in rooms]),
+        tile_type="floor",
+    )
+    assert (gamemap.tiles == expected.tiles).all()
+
+
+def test_game_map_carve_rectangles_clips_to_map():
+    gamemap = GameMap(width=10, height=10)
+    gamemap.carve_rectangles(
+        np.array([-3, 8, 4]),
+        np.array([-3, 8, 4]),
+        np.array([2, 15, 4]),
+        np.array([2, 15, 9]),
+    )
+    floor = gamemap.tiles == tile_types.tile_types["floor"]
+    assert floor[:2, :2].all()
+    assert floor[8:, 8:].all()
+    # Empty rectangles carve nothing
+    assert floor.sum() == 4 + 4
+
+
+def test_game_map_indexes_blocking_entities_by_cell():
+    gamemap = GameMap(width=10, height=10)
+    player = Entity(char="@", name="Player", blocks_movement=True).spawn(gamemap, 1, 0)
+    orc = Entity(char="o", name="Orc", blocks_movement=True).spawn(gamemap, 0, 1)
+    item = Entity(char="!", name="Potion").spawn(gamemap, 2, 2)
+    assert gamemap.get_blocking_entity_at_location(location_x=0, location_y=0) is None
+    assert gamemap.get_blocking_entity_at_location(location_x=1, location_y=0) is player
+    assert gamemap.get_blocking_entity_at_location(location_x=0, location_y=1) is orc
+    assert gamemap.get_blocking_entity_at_location(location_x=2, location_y=2) is None
+    assert gamemap.entities_at(2, 2) == {item}
+
+
+def test_game_map_index_follows_moves_and_removals():
+    gamemap = GameMap(width=10, height=10)
+    orc = Entity(name="Orc", blocks_movement=True).spawn(gamemap, 3, 3)
+    orc.move(dx=1, dy=2)
+    assert (orc.transform.x, orc.transform.y) == (4, 5)
+    assert gamemap.get_blocking_entity_at_location(3, 3) is None
+    assert gamemap.get_blocking_entity_at_location(4, 5) is orc
+
+    gamemap.remove_entity(orc)
+    assert gamemap.entities == set()
+    assert gamemap.get_blocking_entity_at_location(4, 5) is None
+    assert orc.gamemap is None
+
+
+def test_game_map_moving_an_entity_to_another_map_unindexes_it():
+    first, second = GameMap(width=10, height=10), GameMap(width=10, height=10)
+    orc = Entity(name="Orc", blocks_movement=True).spawn(first, 3, 3)
+    second.add_entity(orc)
+    assert first.entities == set() and first.entities_at(3, 3) == set()
+    assert second.get_blocking_entity_at_location(3, 3) is orc
+
+
 # def test_game_map_add_room_to_game_map():
 #     gamemap = GameMap(width=10, height=10)
 #     room = RectangularRoom(x=0, y=0, width=5, height=5)
@@ -48,6 +48,35 @@ def test_entity_spawn():
     assert gamemap.entities.pop() is not entity
 
 
+def test_spawned_entities_share_the_template():
+    from console_game_engine.game_map import GameMap
+
+    gamemap = GameMap(width=10, height=10)
+    prototype = Entity(name="Orc", char="o", blocks_movement=True)
+    first = prototype.spawn(gamemap, x=1, y=2)
+    second = prototype.spawn(gamemap, x=3, y=4)
+
+    assert first.template is prototype.template is second.template
+    assert first.transform is not second.transform
+    assert (first.transform.x, first.transform.y) == (1, 2)
+    assert (prototype.transform.x, prototype.transform.y) == (0, 0)
+    assert first.name == "Orc" and first.char == "o" and first.blocks_movement
+
+
+def test_entity_template_is_immutable():
+    import dataclasses
+
+    import pytest
+
+    entity = Entity(name="Test Entity")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        entity.template.name = "Other"
+    with pytest.raises(AttributeError):
+        entity.name = "Other"
+    with pytest.raises(AttributeError):
+        entity.hit_points = 10
+
+
 def test_entity_move():
     # Test moving an entity
     entity = Entity()
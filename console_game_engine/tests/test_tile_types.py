@@ -0,0 +1,16 @@
+# test_tile_types.py
+
+import numpy as np
+
+from console_game_engine import tile_types
+from console_game_engine.game_map import GameMap
+
+
+def test_encode_and_decode_tiles_round_trip():
+    gamemap = GameMap(width=10, height=8)
+    gamemap.tiles[2:5, 3:6] = tile_types.floor
+    indices = tile_types.encode_tiles(gamemap.tiles)
+    assert indices.dtype == np.uint8
+    assert indices.shape == (10, 8)
+    assert (indices[2:5, 3:6] == tile_types.tile_names.index("floor")).all()
+    assert (tile_types.decode_tiles(indices) == gamemap.tiles).all()
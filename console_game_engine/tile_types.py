@@ -53,3 +53,20 @@ tile_types = {
     "floor": floor,
     "wall": wall,
 }
+
+# Order of the tile types in compact tile index arrays
+tile_names = tuple(tile_types)
+
+
+def encode_tiles(tiles: np.ndarray) -> np.ndarray:
+    """Converts a tile_dt array to a uint8 array of indices into tile_names."""
+    indices = np.zeros(tiles.shape, dtype=np.uint8)
+    for index, name in enumerate(tile_names):
+        indices[tiles == tile_types[name]] = index
+    return indices
+
+
+def decode_tiles(indices: np.ndarray) -> np.ndarray:
+    """Converts an array of indices into tile_names back to a tile_dt array."""
+    palette = np.stack([tile_types[name] for name in tile_names])
+    return palette[indices]
@@ -1,4 +1,4 @@
-import logging
+import logging.config
 from time import perf_counter
 
 import yaml
@@ -32,15 +32,19 @@ def main(config: Configurations, game_logger):
             config.screen_width, config.screen_height, order="F"
         )
 
-        # Generate the default dungeon using the default configuration parameters.
-        config.engine.generate_dungeon(
-            config.default_max_rooms,
-            config.default_room_min_size,
-            config.default_room_max_size,
-        )
-        game_logger.debug(
-            f"Dungeon generated with the following map:\n{config.engine.game_map}\n"
-        )
+        # A chunked world is already loaded around the player; otherwise
+        # generate the default dungeon using the default configuration parameters.
+        if config.camera is None:
+            config.engine.generate_dungeon(
+                config.default_max_rooms,
+                config.default_room_min_size,
+                config.default_room_max_size,
+                seed=config.seed,
+                strategy=config.generation_strategy,
+            )
+            game_logger.debug(
+                f"Dungeon generated with the following map:\n{config.engine.game_map}\n"
+            )
 
         game_logger.debug("Starting the game loop...")
         # Start the game loop, passing in the configuration object, the root console, and the terminal context.
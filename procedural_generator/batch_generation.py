@@ -0,0 +1,191 @@
+# batch_generation.py
+# Generates many dungeons across a process pool, for pre-baking levels and for
+# checking the generator over lots of seeds.  Nothing here needs a tcod window.
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from console_game_engine import entity_factories, tile_types
+from console_game_engine.game_map import GameMap
+from procedural_generator.generation_strategies import STRATEGIES
+from procedural_generator.map_validation import REPAIR_MODES
+
+
+@dataclass(frozen=True)
+class DungeonParameters:
+    width: int = 80
+    height: int = 40
+    max_rooms: int = 20
+    room_min_size: int = 5
+    room_max_size: int = 10
+    max_monsters_per_room: int = 3
+    # Name of a strategy registered in generation_strategies.STRATEGIES
+    strategy: str = "longest_path_in_mst"
+    # "report", "prune" or "reconnect", see map_validation.validate_connectivity
+    connectivity: str = "report"
+
+
+@dataclass
+class BatchResult:
+    seed: int
+    # uint8 indices into tile_types.tile_names, see tile_types.decode_tiles
+    tiles: Optional[np.ndarray]
+    elapsed: float
+    # Set instead of tiles when the generator raised for this seed
+    error: Optional[str] = None
+    # Rooms the player can not walk to in the finished dungeon
+    unreachable_rooms: int = 0
+
+
+def build_dungeon(seed: int, parameters: DungeonParameters):
+    """
+    Generates the dungeon for seed on a bare GameMap and returns the map, the player and the DungeonLayout.  The player starts at a position drawn from the seed, so a seed always gives the same dungeon.  Raises what generate_dungeon raises.
+    """
+    # Imported here so that the logging setup in procedural_gen runs in the worker
+    import procedural_generator.procedural_gen as procedural_gen
+
+    rng = np.random.default_rng(seed)
+    game_map = GameMap(parameters.width, parameters.height)
+    x, y = rng.integers(0, (parameters.width, parameters.height)).tolist()
+    player = entity_factories.player.spawn(gamemap=game_map, x=x, y=y)
+    layout = procedural_gen.generate_dungeon(
+        game_map,
+        parameters.max_rooms,
+        parameters.room_min_size,
+        parameters.room_max_size,
+        player,
+        max_monsters_per_room=parameters.max_monsters_per_room,
+        strategy=parameters.strategy,
+        rng=rng,
+        connectivity=parameters.connectivity,
+    )
+    return game_map, player, layout
+
+
+def generate_one(seed: int, parameters: DungeonParameters) -> BatchResult:
+    start_time = time.perf_counter()
+    try:
+        game_map, _, layout = build_dungeon(seed, parameters)
+    except Exception as error:
+        # Any error is recorded against its seed, so one bad seed can not
+        # abort the rest of the batch in the pool
+        return BatchResult(
+            seed=seed,
+            tiles=None,
+            elapsed=time.perf_counter() - start_time,
+            error=f"{type(error).__name__}: {error}",
+        )
+
+    return BatchResult(
+        seed=seed,
+        tiles=tile_types.encode_tiles(game_map.tiles),
+        elapsed=time.perf_counter() - start_time,
+        unreachable_rooms=len(layout.reachability.unreachable_rooms),
+    )
+
+
+def _generate_chunk(
+    seeds: list[int], parameters: DungeonParameters
+) -> list[BatchResult]:
+    return [generate_one(seed, parameters) for seed in seeds]
+
+
+def generate_batch(
+    seeds: Iterable[int],
+    parameters: DungeonParameters = DungeonParameters(),
+    workers: Optional[int] = None,
+    chunk_size: int = 8,
+) -> Iterator[BatchResult]:
+    """
+    Generates one dungeon per seed and yields the results in seed order, each chunk as soon as it and the chunks before it are finished.  Seeds are sent to the workers in chunks to keep the inter-process overhead small.  workers=1 runs everything in this process.
+    """
+    seeds = list(seeds)
+    if workers == 1:
+        for seed in seeds:
+            yield generate_one(seed, parameters)
+        return
+
+    chunks = [seeds[i : i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_generate_chunk, chunk, parameters) for chunk in chunks
+        ]
+        for future in futures:
+            yield from future.result()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate dungeons for a range of seeds across a process pool."
+    )
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--start-seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=8)
+    parser.add_argument("--width", type=int, default=DungeonParameters.width)
+    parser.add_argument("--height", type=int, default=DungeonParameters.height)
+    parser.add_argument("--max-rooms", type=int, default=DungeonParameters.max_rooms)
+    parser.add_argument(
+        "--room-min-size", type=int, default=DungeonParameters.room_min_size
+    )
+    parser.add_argument(
+        "--room-max-size", type=int, default=DungeonParameters.room_max_size
+    )
+    parser.add_argument(
+        "--strategy", choices=sorted(STRATEGIES), default=DungeonParameters.strategy
+    )
+    parser.add_argument(
+        "--connectivity",
+        choices=REPAIR_MODES,
+        default=DungeonParameters.connectivity,
+        help="Only report rooms the player can not reach, or prune or reconnect them",
+    )
+    parser.add_argument(
+        "--output", help="Directory to write one dungeon_<seed>.npy per dungeon"
+    )
+    args = parser.parse_args(argv)
+
+    parameters = DungeonParameters(
+        width=args.width,
+        height=args.height,
+        max_rooms=args.max_rooms,
+        room_min_size=args.room_min_size,
+        room_max_size=args.room_max_size,
+        strategy=args.strategy,
+        connectivity=args.connectivity,
+    )
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+
+    failures = 0
+    disconnected = 0
+    start_time = time.perf_counter()
+    seeds = range(args.start_seed, args.start_seed + args.count)
+    for result in generate_batch(seeds, parameters, args.workers, args.chunk_size):
+        if result.error:
+            failures += 1
+            print(f"Seed {result.seed} failed: {result.error}")
+            continue
+        disconnected += result.unreachable_rooms > 0
+        if args.output:
+            np.save(
+                os.path.join(args.output, f"dungeon_{result.seed}.npy"), result.tiles
+            )
+    elapsed_time = time.perf_counter() - start_time
+
+    generated = args.count - failures
+    print(
+        f"Generated {generated} dungeons in {elapsed_time:.2f} seconds "
+        f"({generated / elapsed_time:.1f} dungeons per second) "
+        f"with {args.workers} workers, {failures} failed, "
+        f"{disconnected} with unreachable rooms."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# bsp.py
+# Binary space partition of the map for the "bsp" generation strategy.  The
+# map is split recursively, largest part first, until there is one part per
+# room.  Each leaf then gets exactly one room that fits inside it, and the two
+# halves of every split are joined by a corridor, so no draw is ever rejected
+# and the number of rooms is known up front.
+import heapq
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from procedural_generator.room_generation import (
+    RectangularRoom,
+    RoomGenerator,
+    RoomSet,
+)
+
+
+@dataclass
+class Partition:
+    # Half open bounds [x1, x2) x [y1, y2) of this part of the map
+    x1: int
+    y1: int
+    x2: int
+    y2: int
+    # Set on a split part: the axis it was split along, 0 for x and 1 for y,
+    # the coordinate the second half starts at, and the two halves
+    axis: Optional[int] = None
+    split: Optional[int] = None
+    children: Optional[tuple["Partition", "Partition"]] = None
+    # Set on a leaf: the index of its room in the list from place_rooms
+    room: Optional[int] = None
+
+    @property
+    def width(self) -> int:
+        return self.x2 - self.x1
+
+    @property
+    def height(self) -> int:
+        return self.y2 - self.y1
+
+    def contains(self, room: RectangularRoom) -> bool:
+        return (
+            self.x1 <= room.x1
+            and room.x2 <= self.x2
+            and self.y1 <= room.y1
+            and room.y2 <= self.y2
+        )
+
+    def leaves(self) -> list["Partition"]:
+        leaves, stack = [], [self]
+        while stack:
+            part = stack.pop()
+            if part.children is None:
+                leaves.append(part)
+            else:
+                stack.extend(reversed(part.children))
+        return leaves
+
+
+def partition_map(
+    width: int,
+    height: int,
+    leaf_count: int,
+    min_size: int,
+    rng: np.random.Generator = None,
+    keep: Optional[RectangularRoom] = None,
+) -> Partition:
+    """
+    Splits the width x height map into at most leaf_count parts that are at least min_size on each side.  The largest part is always split next, across its longer side, so the parts stay roughly square; a heap keeps that choice O(log n).  No split ever cuts through keep, a room that must end up whole inside one leaf, such as the spawn room.
+    """
+    rng = np.random.default_rng(rng)
+    if keep is not None:
+        keep = RectangularRoom(
+            max(keep.x1, 0),
+            max(keep.y1, 0),
+            min(keep.x2, width) - max(keep.x1, 0),
+            min(keep.y2, height) - max(keep.y1, 0),
+            keep.room_type,
+        )
+
+    root = Partition(0, 0, width, height)
+    # Ordered by area, largest first; the counter breaks ties in split order
+    heap = [(-width * height, 0, root)]
+    leaves = 1
+    counter = 1
+    while heap and leaves < leaf_count:
+        _, _, part = heapq.heappop(heap)
+        halves = _split(part, min_size, rng, keep)
+        if halves is None:
+            # Too small to split, so it stays a leaf
+            continue
+        leaves += 1
+        for half in halves:
+            heapq.heappush(heap, (-half.width * half.height, counter, half))
+            counter += 1
+    return root
+
+
+def _split(
+    part: Partition,
+    min_size: int,
+    rng: np.random.Generator,
+    keep: Optional[RectangularRoom],
+) -> Optional[tuple[Partition, Partition]]:
+    # Longer side first; a square part picks its axis at random
+    if part.width != part.height:
+        axes = (0, 1) if part.width > part.height else (1, 0)
+    else:
+        axes = (0, 1) if rng.random() < 0.5 else (1, 0)
+
+    keep_inside = keep is not None and part.contains(keep)
+    for axis in axes:
+        low, high = (part.x1, part.x2) if axis == 0 else (part.y1, part.y2)
+        if keep_inside:
+            avoid = (keep.x1, keep.x2) if axis == 0 else (keep.y1, keep.y2)
+        else:
+            avoid = None
+        split = _split_position(low + min_size, high - min_size, avoid, rng)
+        if split is None:
+            continue
+
+        if axis == 0:
+            first = Partition(part.x1, part.y1, split, part.y2)
+            second = Partition(split, part.y1, part.x2, part.y2)
+        else:
+            first = Partition(part.x1, part.y1, part.x2, split)
+            second = Partition(part.x1, split, part.x2, part.y2)
+        part.axis, part.split, part.children = axis, split, (first, second)
+        return first, second
+    return None
+
+
+def _split_position(
+    low: int,
+    high: int,
+    avoid: Optional[tuple[int, int]],
+    rng: np.random.Generator,
+) -> Optional[int]:
+    # A uniform draw from low..high, leaving out the positions strictly inside
+    # avoid so that the avoided span ends up whole on one side of the split
+    if low > high:
+        return None
+    if avoid is None:
+        return int(rng.integers(low, high + 1))
+
+    before = max(min(high, avoid[0]) - low + 1, 0)
+    after_start = max(low, avoid[1])
+    after = max(high - after_start + 1, 0)
+    if before + after == 0:
+        return None
+    draw = int(rng.integers(before + after))
+    return low + draw if draw < before else after_start + draw - before
+
+
+def place_rooms(
+    root: Partition,
+    room_min_size: int,
+    room_max_size: int,
+    rng: np.random.Generator = None,
+    spawn_room: Optional[RectangularRoom] = None,
+) -> RoomSet:
+    """
+    Places one room in every leaf of root, as large as room_max_size and as small as room_min_size or the leaf.  The leaf that holds spawn_room gets it as its room, and it is the first room of the set.
+    """
+    rng = np.random.default_rng(rng)
+    # Bounds and types of every room, collected for one RoomSet at the end
+    bounds, room_types = [], []
+    if spawn_room is not None:
+        bounds.append((spawn_room.x1, spawn_room.y1, spawn_room.x2, spawn_room.y2))
+        room_types.append(spawn_room.room_type)
+    for leaf in root.leaves():
+        if spawn_room is not None and _holds(leaf, spawn_room):
+            leaf.room = 0
+            continue
+
+        width, height = (
+            int(rng.integers(min(room_min_size, side), min(room_max_size, side) + 1))
+            for side in (leaf.width, leaf.height)
+        )
+        x = int(rng.integers(leaf.x1, leaf.x2 - width + 1))
+        y = int(rng.integers(leaf.y1, leaf.y2 - height + 1))
+        leaf.room = len(bounds)
+        bounds.append((x, y, x + width, y + height))
+        room_types.append("Basic_Room")
+    return RoomSet(*np.array(bounds, dtype=np.int32).reshape(-1, 4).T, room_types)
+
+
+def _holds(leaf: Partition, room: RectangularRoom) -> bool:
+    # The spawn room can hang over the edge of the map, so only its center is
+    # tested; partition_map keeps the part that is on the map inside one leaf
+    x, y = room.center
+    return leaf.x1 <= x < leaf.x2 and leaf.y1 <= y < leaf.y2
+
+
+def connect_partitions(
+    root: Partition,
+    rooms: RoomSet,
+    room_generator: RoomGenerator,
+    tunnel_width: int = 1,
+) -> RoomSet:
+    """
+    Joins the two halves of every split with a horizontal and a vertical tunnel between the room of each half whose center is nearest the split, so every room is connected and the corridors stay short.
+    """
+    centers = rooms.centers
+    # The room of each half joined at every split, in post order
+    starting_rooms, ending_rooms = [], []
+
+    # Post order walk that returns the room indices under each part
+    def connect(part: Partition) -> np.ndarray:
+        if part.children is None:
+            return np.array([part.room])
+        first, second = (connect(child) for child in part.children)
+        first_room = first[np.argmin(np.abs(centers[first, part.axis] - part.split))]
+        second_room = second[np.argmin(np.abs(centers[second, part.axis] - part.split))]
+        starting_rooms.append(first_room)
+        ending_rooms.append(second_room)
+        return np.concatenate([first, second])
+
+    connect(root)
+    return room_generator.tunnels_between(
+        rooms, starting_rooms, ending_rooms, tunnel_width
+    )
@@ -0,0 +1,91 @@
+# cellular_automata.py
+# Cave layouts for the "cellular_automata" generation strategy.  The map
+# starts as random noise and is smoothed for a few generations: a cell is
+# wall when most of the 3x3 block around it is wall.  The neighbour counts are
+# nine shifted slices of a padded array added together, so every generation
+# is a handful of whole array operations however large the map is.
+import numpy as np
+from scipy import ndimage
+
+from procedural_generator.room_generation import RoomSet
+
+WALL_PROBABILITY = 0.45
+GENERATIONS = 4
+# A cell is wall in the next generation when at least this many of the nine
+# cells of its 3x3 block, itself included, are wall
+WALL_THRESHOLD = 5
+
+
+def wall_counts(walls: np.ndarray) -> np.ndarray:
+    """Number of walls in the 3x3 block around every cell, counting off the map as wall."""
+    width, height = walls.shape
+    padded = np.pad(walls, 1, constant_values=True).astype(np.uint8)
+    counts = np.zeros((width, height), dtype=np.uint8)
+    for dx in range(3):
+        for dy in range(3):
+            counts += padded[dx : dx + width, dy : dy + height]
+    return counts
+
+
+def smooth(walls: np.ndarray, generations: int = GENERATIONS) -> np.ndarray:
+    for _ in range(generations):
+        walls = wall_counts(walls) >= WALL_THRESHOLD
+    return walls
+
+
+def cave_walls(
+    width: int,
+    height: int,
+    rng: np.random.Generator = None,
+    wall_probability: float = WALL_PROBABILITY,
+    generations: int = GENERATIONS,
+) -> np.ndarray:
+    """
+    Boolean (width, height) mask, true on wall, of a smoothed noise cave.  The outermost ring of the map is always wall.
+    """
+    rng = np.random.default_rng(rng)
+    walls = smooth(rng.random((width, height)) < wall_probability, generations)
+    walls[[0, -1], :] = True
+    walls[:, [0, -1]] = True
+    return walls
+
+
+def fill_small_regions(
+    floor: np.ndarray, min_area: int, keep: tuple[int, int] = None
+) -> np.ndarray:
+    """
+    The floor left after filling in every 4-connected region of fewer than min_area cells, except the region holding the keep cell.
+    """
+    labels, count = ndimage.label(floor)
+    kept = np.bincount(labels.ravel(), minlength=count + 1) >= min_area
+    if keep is not None:
+        kept[labels[keep]] = True
+    kept[0] = False
+    return kept[labels]
+
+
+def cave_rooms(floor: np.ndarray, block_size: int, max_rooms: int) -> RoomSet:
+    """
+    Cuts the map into block_size squares and returns a room for each of the max_rooms squares with the most floor, most floor first.  The inside of each room is the bounding box of the floor in its square, so a large cave becomes several rooms and gets spawns spread across it.
+    """
+    xs, ys = np.nonzero(floor)
+    blocks_y = -(-floor.shape[1] // block_size)
+    block = (xs // block_size) * blocks_y + ys // block_size
+    block_count = -(-floor.shape[0] // block_size) * blocks_y
+
+    cells = np.bincount(block, minlength=block_count)
+    x1 = np.full(block_count, floor.shape[0])
+    y1 = np.full(block_count, floor.shape[1])
+    x2 = np.zeros(block_count, dtype=int)
+    y2 = np.zeros(block_count, dtype=int)
+    np.minimum.at(x1, block, xs)
+    np.minimum.at(y1, block, ys)
+    np.maximum.at(x2, block, xs + 1)
+    np.maximum.at(y2, block, ys + 1)
+
+    order = np.argsort(-cells, kind="stable")[:max_rooms]
+    order = order[cells[order] > 0]
+    # The walls of a room are the ring around its inside
+    return RoomSet(
+        x1[order] - 1, y1[order] - 1, x2[order], y2[order], ["Cave"] * len(order)
+    )
@@ -0,0 +1,222 @@
+# chunked_world.py
+# A world too large to hold in one GameMap, split into square chunks that are
+# generated the first time they are needed.  Every chunk is a pure function of
+# the world seed and its chunk coordinates, so chunks can be generated in any
+# order and always come out the same, and neighboring chunks agree on where
+# the tunnels cross the seam between them.
+from dataclasses import dataclass
+
+import numpy as np
+
+from console_game_engine import tile_types
+from console_game_engine.game_map import GameMap
+from procedural_generator.room_generation import (
+    RoomGenerator,
+    RoomSet,
+    l_shaped_tunnels,
+    rectangles_mask,
+)
+
+# Tags that keep the random streams of rooms and of the two kinds of seam apart
+_ROOMS, _VERTICAL_SEAM, _HORIZONTAL_SEAM = 0, 1, 2
+
+FLOOR = tile_types.tile_names.index("floor")
+WALL = tile_types.tile_names.index("wall")
+
+
+@dataclass
+class Chunk:
+    cx: int
+    cy: int
+    # uint8 indices into tile_types.tile_names, shape (chunk_size, chunk_size)
+    tiles: np.ndarray
+    explored: np.ndarray
+    # In chunk coordinates; the first room is the hub the doors connect to
+    rooms: RoomSet
+    tunnels: RoomSet
+    # Floor cells on the east, south, west and north edges, in chunk coordinates
+    doors: list[tuple[int, int]]
+
+
+class ChunkedWorld:
+    """
+    Unbounded map made of chunk_size square chunks, generated lazily from the world seed.  Each chunk holds rooms from RoomGenerator around a hub room in its middle, and a tunnel from the hub to one door on each of its four edges.  The door on an edge is drawn from a random stream shared by the two chunks on either side of it, so the tunnels of neighboring chunks always meet at the seam.  Only the chunks that have been asked for are ever generated or stored.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        chunk_size: int = 32,
+        max_rooms_per_chunk: int = 6,
+        room_min_size: int = 4,
+        room_max_size: int = 8,
+    ) -> None:
+        if chunk_size < room_max_size + 8:
+            raise ValueError("Chunks must be at least room_max_size + 8 cells wide.")
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.max_rooms_per_chunk = max_rooms_per_chunk
+        self.room_min_size = room_min_size
+        self.room_max_size = room_max_size
+        self.chunks: dict[tuple[int, int], Chunk] = {}
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def chunk_coordinates(self, x: int, y: int) -> tuple[int, int]:
+        return x // self.chunk_size, y // self.chunk_size
+
+    def chunk(self, cx: int, cy: int) -> Chunk:
+        chunk = self.chunks.get((cx, cy))
+        if chunk is None:
+            chunk = self._generate_chunk(cx, cy)
+            self.chunks[(cx, cy)] = chunk
+        return chunk
+
+    def ensure_loaded_around(
+        self, x: int, y: int, radius: int
+    ) -> list[tuple[int, int]]:
+        """Generates every chunk within radius cells of (x, y) and returns the coordinates of the ones that were new."""
+        cx1, cy1 = self.chunk_coordinates(x - radius, y - radius)
+        cx2, cy2 = self.chunk_coordinates(x + radius, y + radius)
+        generated = []
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                if (cx, cy) not in self.chunks:
+                    self.chunk(cx, cy)
+                    generated.append((cx, cy))
+        return generated
+
+    def tile_index_at(self, x: int, y: int) -> int:
+        chunk = self.chunk(*self.chunk_coordinates(x, y))
+        return int(chunk.tiles[x % self.chunk_size, y % self.chunk_size])
+
+    def is_walkable(self, x: int, y: int) -> bool:
+        return tile_types.tile_names[self.tile_index_at(x, y)] == "floor"
+
+    def window(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        """(width, height) array of tile indices with (x, y) in world coordinates at its origin."""
+        return self._gather("tiles", x, y, width, height)
+
+    def explored_window(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        return self._gather("explored", x, y, width, height)
+
+    def load_view(self, game_map: GameMap, x: int, y: int) -> None:
+        """Fills a screen sized game_map with the part of the world whose top left is (x, y)."""
+        game_map.set_tiles(
+            slice(None),
+            tile_types.decode_tiles(self.window(x, y, game_map.width, game_map.height)),
+        )
+        game_map.explored[:] = self.explored_window(
+            x, y, game_map.width, game_map.height
+        )
+
+    def store_view(self, game_map: GameMap, x: int, y: int) -> None:
+        """Writes what has been explored in a view loaded with load_view back to the chunks."""
+        for chunk, world_slice, chunk_slice in self._overlaps(
+            x, y, game_map.width, game_map.height
+        ):
+            chunk.explored[chunk_slice] |= game_map.explored[world_slice]
+
+    def _gather(self, field: str, x: int, y: int, width: int, height: int):
+        window = None
+        for chunk, world_slice, chunk_slice in self._overlaps(x, y, width, height):
+            source = getattr(chunk, field)
+            if window is None:
+                window = np.empty((width, height), dtype=source.dtype)
+            window[world_slice] = source[chunk_slice]
+        return window
+
+    def _overlaps(self, x: int, y: int, width: int, height: int):
+        # Yields every chunk under the window with the matching slices of the
+        # window and of the chunk
+        size = self.chunk_size
+        cx1, cy1 = self.chunk_coordinates(x, y)
+        cx2, cy2 = self.chunk_coordinates(x + width - 1, y + height - 1)
+        for cx in range(cx1, cx2 + 1):
+            x1, x2 = max(x, cx * size), min(x + width, (cx + 1) * size)
+            for cy in range(cy1, cy2 + 1):
+                y1, y2 = max(y, cy * size), min(y + height, (cy + 1) * size)
+                yield (
+                    self.chunk(cx, cy),
+                    (slice(x1 - x, x2 - x), slice(y1 - y, y2 - y)),
+                    (
+                        slice(x1 - cx * size, x2 - cx * size),
+                        slice(y1 - cy * size, y2 - cy * size),
+                    ),
+                )
+
+    def _rng(self, *words: int) -> np.random.Generator:
+        # SeedSequence only takes non-negative words, so coordinates wrap to 32 bits
+        return np.random.default_rng(
+            np.random.SeedSequence([self.seed, *(word % 2**32 for word in words)])
+        )
+
+    def _seam_offset(self, tag: int, cx: int, cy: int) -> int:
+        # Where along the seam the door is, kept off the corners of the chunk
+        return int(self._rng(tag, cx, cy).integers(2, self.chunk_size - 2))
+
+    def _doors(self, cx: int, cy: int) -> list[tuple[int, int]]:
+        # A vertical seam is keyed by the chunk to its west, a horizontal one
+        # by the chunk to its north, so both sides draw the same offset
+        last = self.chunk_size - 1
+        return [
+            (last, self._seam_offset(_VERTICAL_SEAM, cx, cy)),
+            (self._seam_offset(_HORIZONTAL_SEAM, cx, cy), last),
+            (0, self._seam_offset(_VERTICAL_SEAM, cx - 1, cy)),
+            (self._seam_offset(_HORIZONTAL_SEAM, cx, cy - 1), 0),
+        ]
+
+    def _generate_chunk(self, cx: int, cy: int) -> Chunk:
+        size = self.chunk_size
+        room_generator = RoomGenerator(self._rng(_ROOMS, cx, cy))
+        rooms = room_generator.generate_rooms(
+            size,
+            size,
+            self.max_rooms_per_chunk,
+            self.room_min_size,
+            self.room_max_size,
+            size // 2,
+            size // 2,
+        )
+        rooms.room_types = np.where(
+            np.arange(len(rooms)) == 0, "Hub_Room", rooms.room_types
+        )
+
+        doors = self._doors(cx, cy)
+        door_x, door_y = np.array(doors).T
+        hub_x, hub_y = rooms.centers[0]
+        # The tunnel's last leg runs straight into the edge at the door:
+        # horizontal for the east and west doors, vertical for the others, so
+        # the east and west tunnels start at the door and the others at the hub
+        from_door = (door_x == 0) | (door_x == size - 1)
+        door_tunnels = l_shaped_tunnels(
+            np.where(from_door, door_x, hub_x),
+            np.where(from_door, door_y, hub_y),
+            np.where(from_door, hub_x, door_x),
+            np.where(from_door, hub_y, door_y),
+        )
+        tunnels = RoomSet.concatenate(
+            [room_generator.generate_tunnels(1, rooms), door_tunnels]
+        )
+
+        room_bounds = rooms.bounds("inner")
+        tunnel_bounds = tunnels.bounds("outer")
+        tiles = np.full((size, size), WALL, dtype=np.uint8)
+        tiles[
+            rectangles_mask(
+                size,
+                size,
+                *(np.concatenate(pair) for pair in zip(room_bounds, tunnel_bounds)),
+            )
+        ] = FLOOR
+
+        return Chunk(
+            cx=cx,
+            cy=cy,
+            tiles=tiles,
+            explored=np.zeros((size, size), dtype=bool),
+            rooms=rooms,
+            tunnels=tunnels,
+            doors=doors,
+        )
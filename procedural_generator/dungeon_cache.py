@@ -0,0 +1,230 @@
+# dungeon_cache.py
+# A dungeon is a pure function of its seed and generation parameters, so once
+# one has been generated it can be reused instead of rerunning the whole
+# room, Delaunay and MST pipeline.  Entries live in a bounded in-process LRU
+# and, optionally, as .npy files on disk that are memory mapped on a hit.
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import astuple, dataclass
+from typing import Optional
+
+import numpy as np
+
+from console_game_engine import entity_factories, tile_types
+from console_game_engine.entity import Entity
+from console_game_engine.game_map import GameMap
+from procedural_generator.generation_strategies import strategy_name
+from procedural_generator.room_generation import RoomSet
+
+room_dt = np.dtype(
+    [
+        ("x", np.int32),
+        ("y", np.int32),
+        ("width", np.int32),
+        ("height", np.int32),
+        ("room_type", "U32"),
+    ]
+)
+
+spawn_dt = np.dtype([("x", np.int32), ("y", np.int32), ("name", "U32")])
+
+# Part of every DungeonKey.  Bump it whenever a change to the generator makes
+# the same seed and parameters produce a different dungeon, so entries that
+# an older version wrote to a cache directory are regenerated, not served.
+GENERATOR_VERSION = 1
+
+
+@dataclass(frozen=True)
+class DungeonKey:
+    seed: int
+    width: int
+    height: int
+    max_rooms: int
+    room_min_size: int
+    room_max_size: int
+    max_monsters_per_room: int
+    strategy: str
+    # The spawn room is built around the player, so the layout depends on it
+    player_x: int
+    player_y: int
+    generator_version: int = GENERATOR_VERSION
+
+    @property
+    def digest(self) -> str:
+        return hashlib.sha1(repr(astuple(self)).encode()).hexdigest()
+
+
+@dataclass
+class CachedDungeon:
+    # uint8 indices into tile_types.tile_names
+    tiles: np.ndarray
+    rooms: np.ndarray
+    spawns: np.ndarray
+
+    @classmethod
+    def from_generation(
+        cls, game_map: GameMap, rooms: RoomSet, spawns: list[Entity]
+    ) -> "CachedDungeon":
+        room_array = np.zeros(len(rooms), dtype=room_dt)
+        room_array["x"], room_array["y"] = rooms.x1, rooms.y1
+        room_array["width"], room_array["height"] = rooms.widths, rooms.heights
+        room_array["room_type"] = rooms.room_types
+        return cls(
+            tiles=tile_types.encode_tiles(game_map.tiles),
+            rooms=room_array,
+            spawns=np.array(
+                [
+                    (entity.transform.x, entity.transform.y, entity.name)
+                    for entity in spawns
+                ],
+                dtype=spawn_dt,
+            ),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.tiles.nbytes + self.rooms.nbytes + self.spawns.nbytes
+
+    def room_set(self) -> RoomSet:
+        rooms = self.rooms
+        return RoomSet(
+            rooms["x"],
+            rooms["y"],
+            rooms["x"] + rooms["width"],
+            rooms["y"] + rooms["height"],
+            rooms["room_type"],
+        )
+
+    def apply_to(self, game_map: GameMap) -> list[Entity]:
+        game_map.set_tiles(slice(None), tile_types.decode_tiles(self.tiles))
+        return [
+            entity_factories.prototypes[name].spawn(game_map, int(x), int(y))
+            for x, y, name in self.spawns.tolist()
+        ]
+
+
+class DungeonCache:
+    """
+    Two tier cache of generated dungeons.  The memory tier is an LRU bounded by the total size of the arrays it holds.  When a directory is given, every entry is also written there as three .npy files, which are opened with mmap_mode="r" on a later miss in memory, so a disk hit costs a memory map rather than a regeneration.
+    """
+
+    def __init__(
+        self, max_memory_bytes: int = 64 * 1024 * 1024, directory: Optional[str] = None
+    ) -> None:
+        self.max_memory_bytes = max_memory_bytes
+        self.directory = directory
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[DungeonKey, CachedDungeon] = OrderedDict()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: DungeonKey) -> Optional[CachedDungeon]:
+        dungeon = self._entries.get(key)
+        if dungeon is not None:
+            self._entries.move_to_end(key)
+        else:
+            dungeon = self._load(key)
+            if dungeon is not None:
+                self._remember(key, dungeon)
+
+        if dungeon is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return dungeon
+
+    def put(self, key: DungeonKey, dungeon: CachedDungeon) -> None:
+        self._remember(key, dungeon)
+        if self.directory:
+            for part, array in self._parts(dungeon).items():
+                # Write then rename so a reader never maps a half written file
+                path = self._path(key, part)
+                with open(path + ".tmp", "wb") as f:
+                    np.save(f, array)
+                os.replace(path + ".tmp", path)
+
+    def _remember(self, key: DungeonKey, dungeon: CachedDungeon) -> None:
+        if key in self._entries:
+            self.memory_bytes -= self._entries.pop(key).nbytes
+        self._entries[key] = dungeon
+        self.memory_bytes += dungeon.nbytes
+        while self.memory_bytes > self.max_memory_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.memory_bytes -= evicted.nbytes
+
+    def _load(self, key: DungeonKey) -> Optional[CachedDungeon]:
+        if not self.directory:
+            return None
+        paths = {part: self._path(key, part) for part in ("tiles", "rooms", "spawns")}
+        if not all(os.path.exists(path) for path in paths.values()):
+            return None
+        return CachedDungeon(
+            **{part: np.load(path, mmap_mode="r") for part, path in paths.items()}
+        )
+
+    def _path(self, key: DungeonKey, part: str) -> str:
+        return os.path.join(self.directory, f"{key.digest}_{part}.npy")
+
+    @staticmethod
+    def _parts(dungeon: CachedDungeon) -> dict[str, np.ndarray]:
+        return {
+            "tiles": dungeon.tiles,
+            "rooms": dungeon.rooms,
+            "spawns": dungeon.spawns,
+        }
+
+
+def generate_dungeon_cached(
+    cache: DungeonCache,
+    seed: int,
+    game_map: GameMap,
+    max_rooms: int,
+    room_min_size: int,
+    room_max_size: int,
+    player: Entity,
+    max_monsters_per_room=3,
+    strategy="longest_path_in_mst",
+) -> CachedDungeon:
+    """
+    Fills game_map with the dungeon for this seed and these parameters, generating it with procedural_gen.generate_dungeon only when the cache does not already hold it.
+    """
+    # Imported here so the cache can be used without the generator's logging setup
+    import procedural_generator.procedural_gen as procedural_gen
+
+    key = DungeonKey(
+        seed=seed,
+        width=game_map.width,
+        height=game_map.height,
+        max_rooms=max_rooms,
+        room_min_size=room_min_size,
+        room_max_size=room_max_size,
+        max_monsters_per_room=max_monsters_per_room,
+        strategy=strategy_name(strategy),
+        player_x=player.transform.x,
+        player_y=player.transform.y,
+    )
+
+    dungeon = cache.get(key)
+    if dungeon is not None:
+        dungeon.apply_to(game_map)
+        return dungeon
+
+    layout = procedural_gen.generate_dungeon(
+        game_map,
+        max_rooms,
+        room_min_size,
+        room_max_size,
+        player,
+        max_monsters_per_room=max_monsters_per_room,
+        strategy=strategy,
+        rng=np.random.default_rng(seed),
+    )
+    dungeon = CachedDungeon.from_generation(game_map, layout.rooms, layout.monsters)
+    cache.put(key, dungeon)
+    return dungeon
@@ -1,6 +1,8 @@
-import random
+import math
 import numpy as np
 
+SAMPLING_MODES = ("rejection", "poisson")
+
 
 class NonOverlappingRandomPointsGenerator:
     """
@@ -9,18 +11,27 @@ class NonOverlappingRandomPointsGenerator:
     Turns out it is a naturally hard problem to solve how many points can be generated in a given space with a given minimum distance. So I forwent trying to algorithmically solve that problem and instead just set a limit on the number of points that can be generated.  If you want to generate a lot of points, you ßcan increase the max_coordinate parameter.  If you want to generate a lot of points in a small space, you can decrease the min_dist parameter.
     """
 
-    def __init__(self, num_of_points, min_dist, max_coordinate):
+    def __init__(
+        self, num_of_points, min_dist, max_coordinate, sampling="rejection", rng=None
+    ):
         self.num_of_points = num_of_points
         self.min_dist = min_dist
         self.max_coordinate = max_coordinate
+        self.sampling = sampling
+        self.rng = np.random.default_rng(rng)
         self.depth = max_coordinate**2
         self.check_values()
 
     @property
     def generated_points(self) -> list[tuple[int, int]]:
+        if self.sampling == "poisson":
+            return PoissonDiskSampler(
+                self.num_of_points, self.min_dist, self.max_coordinate, rng=self.rng
+            ).sample()
+
         potential_points = []
         while self.generating(potential_points):
-            point = generate_random_point(self.max_coordinate)
+            point = generate_random_point(self.max_coordinate, self.rng)
             if self.point_is_acceptable(potential_points, point):
                 potential_points.append(point)
             else:
@@ -52,15 +63,107 @@ class NonOverlappingRandomPointsGenerator:
             raise ValueError("Minimum distance must be greater than 0")
         if self.min_dist >= self.max_coordinate:
             raise ValueError("Minimum distance must be less than max_coordinate")
+        if self.sampling not in SAMPLING_MODES:
+            raise ValueError(f"Sampling mode must be one of {SAMPLING_MODES}")
+
+
+class PoissonDiskSampler:
+    """
+    Bridson's Poisson-disk sampling on the integer grid.  Accepted points are stored in a background grid with cells of size min_dist / sqrt(2), so every cell holds at most one point and a candidate only has to be compared against the points in the surrounding 5x5 block of cells.  Generation is roughly linear in the number of points instead of quadratic.
+
+    Points obey the same bounds as NonOverlappingRandomPointsGenerator: min_dist < x, y < max_coordinate - min_dist.
+    """
 
+    def __init__(
+        self, num_of_points, min_dist, max_coordinate, attempts_per_point=30, rng=None
+    ):
+        self.num_of_points = num_of_points
+        self.min_dist = min_dist
+        self.max_coordinate = max_coordinate
+        self.attempts_per_point = attempts_per_point
+        self.rng = np.random.default_rng(rng)
+
+        self.low = math.floor(min_dist) + 1
+        self.high = math.ceil(max_coordinate - min_dist) - 1
+        self.cell_size = min_dist / math.sqrt(2)
+        self.grid_size = int(max_coordinate / self.cell_size) + 1
+        # Flat row-major grid holding the accepted point in each cell, or None
+        self.grid = [None] * (self.grid_size * self.grid_size)
+
+    def sample(self) -> list[tuple[int, int]]:
+        points = []
+        if self.low > self.high:
+            return points
+
+        first_point = tuple(self.rng.integers(self.low, self.high + 1, 2).tolist())
+        self._accept(points, first_point)
+        active = [0]
+
+        while active and len(points) < self.num_of_points:
+            active_index = int(self.rng.integers(len(active)))
+            origin = points[active[active_index]]
+
+            for _ in range(self.attempts_per_point):
+                candidate = self._candidate_around(origin)
+                if self._is_acceptable(candidate):
+                    self._accept(points, candidate)
+                    active.append(len(points) - 1)
+                    break
+            else:
+                # No room left around this point, retire it.
+                active[active_index] = active[-1]
+                active.pop()
+
+        return points
+
+    def _candidate_around(self, origin: tuple[int, int]) -> tuple[int, int]:
+        # Draw from the annulus [min_dist, 2 * min_dist) around the origin
+        radius_draw, angle_draw = self.rng.random(2).tolist()
+        radius = self.min_dist * (1 + radius_draw)
+        angle = 2 * math.pi * angle_draw
+        return (
+            round(origin[0] + radius * math.cos(angle)),
+            round(origin[1] + radius * math.sin(angle)),
+        )
 
-def generate_random_point(max_coordinate: int) -> tuple[int, int]:
+    def _is_acceptable(self, candidate: tuple[int, int]) -> bool:
+        x, y = candidate
+        if not (self.low <= x <= self.high and self.low <= y <= self.high):
+            return False
+
+        cell_x, cell_y = self._cell_of(candidate)
+        min_dist_squared = self.min_dist**2
+        grid, grid_size = self.grid, self.grid_size
+        for neighbor_x in range(max(cell_x - 2, 0), min(cell_x + 3, grid_size)):
+            row = neighbor_x * grid_size
+            for neighbor_y in range(max(cell_y - 2, 0), min(cell_y + 3, grid_size)):
+                other = grid[row + neighbor_y]
+                if (
+                    other is not None
+                    and (other[0] - x) ** 2 + (other[1] - y) ** 2 < min_dist_squared
+                ):
+                    return False
+        return True
+
+    def _accept(self, points: list[tuple[int, int]], point: tuple[int, int]):
+        cell_x, cell_y = self._cell_of(point)
+        self.grid[cell_x * self.grid_size + cell_y] = point
+        points.append(point)
+
+    def _cell_of(self, point: tuple[int, int]) -> tuple[int, int]:
+        return (int(point[0] / self.cell_size), int(point[1] / self.cell_size))
+
+
+def generate_random_point(
+    max_coordinate: int, rng: np.random.Generator = None
+) -> tuple[int, int]:
     if type(max_coordinate) != int:
         raise TypeError("Scale must be an integer")
     if max_coordinate <= 0:
         raise ValueError("Scale must be greater than 0")
 
-    return (random.randint(0, max_coordinate), random.randint(0, max_coordinate))
+    rng = np.random.default_rng(rng)
+    return tuple(rng.integers(0, max_coordinate + 1, 2).tolist())
 
 
 def other_points_are_min_dist_away(
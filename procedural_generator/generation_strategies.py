@@ -1,26 +1,95 @@
 # generation_strategies.py | 0
 
-from matplotlib.pyplot import plasma
+from typing import Callable
+
+import numpy as np
+
+from console_game_engine import tile_types
 from console_game_engine.game_map import GameMap
+from procedural_generator.bsp import connect_partitions, partition_map, place_rooms
+from procedural_generator.cellular_automata import (
+    cave_rooms,
+    cave_walls,
+    fill_small_regions,
+)
 from procedural_generator.graph_explorer import GraphExplorer
+from procedural_generator.map_validation import (
+    check_reachability,
+    reconnect_unreachable,
+)
 from procedural_generator.minimum_spanning_tree_finder import MinimumSpanningTreeFinder
-from procedural_generator.room_generation import RoomGenerator
+from procedural_generator.point_validation import validate_points
+from procedural_generator.room_generation import RoomGenerator, RoomSet
+
+# Every strategy has the same signature:
+#   strategy(game_map, max_rooms, player_transform, room_min_size, room_max_size,
+#            tunnel_width, rng) -> (rooms, tunnels)
+# It carves the dungeon into game_map itself, and returns the rooms, the first
+# of which holds the player, and the tunnels it dug, each as a RoomSet.
+STRATEGIES: dict[str, Callable] = {}
+
+
+def register_strategy(name: str):
+    """Decorator that adds a generation strategy to STRATEGIES under name."""
+
+    def register(strategy: Callable) -> Callable:
+        if name in STRATEGIES:
+            raise ValueError(f"A strategy named '{name}' is already registered.")
+        STRATEGIES[name] = strategy
+        return strategy
+
+    return register
+
+
+def get_strategy(strategy) -> Callable:
+    """Looks a strategy up by name; strategy functions are passed through."""
+    if callable(strategy):
+        return strategy
+    if strategy not in STRATEGIES:
+        raise ValueError(
+            f"Unknown generation strategy '{strategy}', expected one of {sorted(STRATEGIES)}."
+        )
+    return STRATEGIES[strategy]
+
+
+def strategy_name(strategy) -> str:
+    """The registered name of a strategy given by name or as a function."""
+    if not callable(strategy):
+        get_strategy(strategy)
+        return strategy
+    for name, registered in STRATEGIES.items():
+        if registered is strategy:
+            return name
+    return strategy.__name__
+
+
+def carve_rooms_and_tunnels(
+    game_map: GameMap, rooms: RoomSet, tunnels: RoomSet
+) -> None:
+    # Rooms keep their outer ring of wall, tunnels are floor edge to edge
+    room_bounds = rooms.bounds("inner")
+    tunnel_bounds = tunnels.bounds("outer")
+    game_map.carve_rectangles(
+        *(np.concatenate(pair) for pair in zip(room_bounds, tunnel_bounds)),
+        tile_type="floor",
+    )
 
 
+@register_strategy("longest_path_in_mst")
 def longest_path_in_mst_strategy(
-    dungeon_width: int,
-    dungeon_height: int,
+    game_map: GameMap,
     max_rooms: int,
     player_transform: tuple[int, int],
     room_min_size=3,
     room_max_size=10,
     tunnel_width=1,
-) -> tuple[list, list]:
-    room_generator = RoomGenerator()
+    rng: np.random.Generator = None,
+) -> tuple[RoomSet, RoomSet]:
+    room_generator = RoomGenerator(rng)
 
     rooms = room_generator.generate_rooms(
-        dungeon_width,
-        dungeon_height,
+        game_map.width,
+        game_map.height,
         max_rooms,
         room_min_size,
         room_max_size,
@@ -28,38 +97,41 @@ def longest_path_in_mst_strategy(
         player_transform.y,
     )
 
-    room_centers = [room.center for room in rooms]
-    mst = MinimumSpanningTreeFinder(room_centers)
+    # Validated once here; the MST and triangulator reuse the token
+    room_centers = validate_points(rooms.centers)
+    mst = MinimumSpanningTreeFinder(room_centers, algorithm="delaunay_kruskal")
 
-    # For reach index in the list of points in longest path, get the room that
-    connected_rooms = [
-        rooms[i]
-        for i in GraphExplorer(
-            mst.minimum_spanning_tree, room_centers
+    # The indices of the rooms along the longest path through the tree
+    connected_rooms = list(
+        GraphExplorer(
+            mst.minimum_spanning_tree, room_centers.array
         ).points_of_longest_path
-    ]
+    )
     # Check to see if the the first room in the rooms list is in the connected rooms list and if it is not append it front of the list
-    if rooms[0] not in connected_rooms:
-        connected_rooms.insert(0, rooms[0])
+    if 0 not in connected_rooms:
+        connected_rooms.insert(0, 0)
 
-    tunnels = room_generator.generate_tunnels(tunnel_width, connected_rooms)
+    tunnels = room_generator.tunnels_between(
+        rooms, connected_rooms[:-1], connected_rooms[1:], tunnel_width
+    )
 
+    carve_rooms_and_tunnels(game_map, rooms, tunnels)
     return rooms, tunnels
 
 
+@register_strategy("basic")
 def basic_generation_strategy(
     game_map: GameMap,
-    max_rooms,
+    max_rooms: int,
+    player_transform: tuple[int, int],
     room_min_size=3,
     room_max_size=10,
-    player_transform: tuple[int, int] = (0, 0),
     tunnel_width=1,
-) -> tuple[list, list]:
-    room_generator = RoomGenerator()
-    rooms = []
-    tunnels = []
+    rng: np.random.Generator = None,
+) -> tuple[RoomSet, RoomSet]:
+    room_generator = RoomGenerator(rng)
 
-    generated_rooms = room_generator.generate_rooms(
+    rooms = room_generator.generate_rooms(
         game_map.width,
         game_map.height,
         max_rooms,
@@ -68,8 +140,82 @@ def basic_generation_strategy(
         player_transform.x,
         player_transform.y,
     )
-    for room in generated_rooms:
-        rooms.append(room)
-
     tunnels = room_generator.generate_tunnels(tunnel_width, rooms)
+
+    carve_rooms_and_tunnels(game_map, rooms, tunnels)
+    return rooms, tunnels
+
+
+@register_strategy("bsp")
+def bsp_generation_strategy(
+    game_map: GameMap,
+    max_rooms: int,
+    player_transform: tuple[int, int],
+    room_min_size=3,
+    room_max_size=10,
+    tunnel_width=1,
+    rng: np.random.Generator = None,
+) -> tuple[RoomSet, RoomSet]:
+    # Splits the map into max_rooms + 1 parts, fewer if the map is too small,
+    # puts one room in each, the spawn room being one of them, and joins the
+    # halves of every split, so every room is reachable and no draw is wasted
+    rng = np.random.default_rng(rng)
+    room_generator = RoomGenerator(rng)
+    spawn_room = room_generator.create_spawn_room(
+        player_transform.x, player_transform.y
+    )
+
+    partitions = partition_map(
+        game_map.width,
+        game_map.height,
+        max_rooms + 1,
+        room_min_size,
+        rng,
+        keep=spawn_room,
+    )
+    rooms = place_rooms(partitions, room_min_size, room_max_size, rng, spawn_room)
+    tunnels = connect_partitions(partitions, rooms, room_generator, tunnel_width)
+
+    carve_rooms_and_tunnels(game_map, rooms, tunnels)
+    return rooms, tunnels
+
+
+@register_strategy("cellular_automata")
+def cellular_automata_strategy(
+    game_map: GameMap,
+    max_rooms: int,
+    player_transform: tuple[int, int],
+    room_min_size=3,
+    room_max_size=10,
+    tunnel_width=1,
+    rng: np.random.Generator = None,
+) -> tuple[RoomSet, RoomSet]:
+    # Smoothed noise caves instead of rectangles.  Caves smaller than a
+    # room_min_size square are filled in, and the others are joined to the
+    # player's by tunnels.  The rooms are the spawn room and the floor of the
+    # max_rooms room_max_size squares of the map with the most cave in them,
+    # so the spawn planner and the connectivity check work on them unchanged.
+    rng = np.random.default_rng(rng)
+    room_generator = RoomGenerator(rng)
+    spawn_room = room_generator.create_spawn_room(
+        player_transform.x, player_transform.y
+    )
+    start = (player_transform.x, player_transform.y)
+
+    floor = ~cave_walls(game_map.width, game_map.height, rng)
+    floor[
+        max(spawn_room.x1 + 1, 0) : spawn_room.x2,
+        max(spawn_room.y1 + 1, 0) : spawn_room.y2,
+    ] = True
+    floor = fill_small_regions(floor, room_min_size * room_min_size, keep=start)
+    game_map.set_tiles(floor, tile_types.floor)
+
+    rooms = RoomSet.concatenate(
+        [RoomSet.from_rooms([spawn_room]), cave_rooms(floor, room_max_size, max_rooms)]
+    )
+    # Rooms are bounding boxes, so test the caves themselves for islands
+    report = check_reachability(game_map, rooms, start)
+    tunnels = RoomSet.empty()
+    if report.component_count > 1:
+        tunnels = reconnect_unreachable(game_map, report, tunnel_width)
     return rooms, tunnels
@@ -1,59 +1,131 @@
-import networkx as nx
 import numpy as np
 
 
+class AdjacencyIndex:
+    """
+    Compressed adjacency of an undirected edge list.  The neighbors of node u are neighbors[offsets[u] : offsets[u + 1]], with the matching edge lengths in weights, and degree[u] is the number of edges touching u.  Built once in O(E) and shared by every query on the graph.
+    """
+
+    def __init__(self, edges, nodes) -> None:
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        nodes = np.asarray(nodes, dtype=np.float64)
+        self.num_nodes = len(nodes)
+        self.edges = edges
+
+        deltas = nodes[edges[:, 0]] - nodes[edges[:, 1]]
+        edge_weights = np.hypot(deltas[:, 0], deltas[:, 1])
+
+        # Each undirected edge is stored once from each end
+        sources = np.concatenate([edges[:, 0], edges[:, 1]])
+        targets = np.concatenate([edges[:, 1], edges[:, 0]])
+        order = np.argsort(sources, kind="stable")
+
+        self.degree = np.bincount(sources, minlength=self.num_nodes)
+        self.offsets = np.concatenate([[0], np.cumsum(self.degree)])
+        self.neighbors = targets[order]
+        self.weights = np.concatenate([edge_weights, edge_weights])[order]
+
+    def neighbors_of(self, node: int) -> np.ndarray:
+        return self.neighbors[self.offsets[node] : self.offsets[node + 1]]
+
+
 class GraphExplorer:
     def __init__(self, graph, nodes):
         self.graph = graph
         self.nodes = nodes
+        self.adjacency = AdjacencyIndex(graph, nodes)
         self.longest_path, self.longest_path_length = self._find_longest_path()
-        self.points_of_longest_path = sorted(set(sum(self.longest_path, ())))
+        self.points_of_longest_path = sorted(
+            {node for edge in self.longest_path for node in edge}
+        )
         self.points_of_interest = self._find_points_of_interest()
+        self.branch_depths, self.branch_sizes = self._measure_branches()
 
     def _find_longest_path(self):
-        G = nx.DiGraph()
-        for u, v in self.graph:
-            dist = np.sqrt(
-                (self.nodes[u][0] - self.nodes[v][0]) ** 2
-                + (self.nodes[u][1] - self.nodes[v][1]) ** 2
-            )
-            G.add_edge(u, v, weight=dist)
-            G.add_edge(v, u, weight=dist)
-
-        paths = dict(nx.all_pairs_dijkstra_path(G))
-        longest_path = []
-        length = 0
-
-        for u, u_paths in paths.items():
-            for v, path in u_paths.items():
-                if u != v:
-                    path_length = sum(
-                        G[path[i]][path[i + 1]]["weight"] for i in range(len(path) - 1)
-                    )
-                    if path_length > length:
-                        longest_path = [
-                            (path[i], path[i + 1]) for i in range(len(path) - 1)
-                        ]
-                        length = path_length
+        # The graph is a tree (the MST), so the longest shortest path is its
+        # diameter: the farthest node from any node is one end of it, and the
+        # farthest node from that end is the other.
+        if len(self.graph) == 0:
+            return [], 0
+
+        start = int(self.graph[0][0])
+        distances, _ = self._weighted_traversal(start)
+        end_a = max(distances, key=distances.get)
+        distances, parents = self._weighted_traversal(end_a)
+        end_b = max(distances, key=distances.get)
+
+        path = [end_b]
+        while path[-1] != end_a:
+            path.append(parents[path[-1]])
+        path.reverse()
 
-        return longest_path, length
+        longest_path = [(path[i], path[i + 1]) for i in range(len(path) - 1)]
+        return longest_path, distances[end_b]
+
+    def _weighted_traversal(
+        self, start: int
+    ) -> tuple[dict[int, float], dict[int, int]]:
+        offsets = self.adjacency.offsets.tolist()
+        neighbors = self.adjacency.neighbors.tolist()
+        weights = self.adjacency.weights.tolist()
+
+        distances = {start: 0.0}
+        parents = {start: start}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for i in range(offsets[node], offsets[node + 1]):
+                neighbor = neighbors[i]
+                if neighbor not in distances:
+                    distances[neighbor] = distances[node] + weights[i]
+                    parents[neighbor] = node
+                    stack.append(neighbor)
+        return distances, parents
 
     def _find_points_of_interest(self) -> list[int]:
         if len(self.longest_path) == 0:
             raise ValueError("No longest path, cannot find points of interest.")
-        else:
-            points_of_interest = [
-                point
-                for point in self.points_of_longest_path
-                if any(
-                    edge[0] == point
-                    and edge[1] not in self.points_of_longest_path
-                    or edge[1] == point
-                    and edge[0] not in self.points_of_longest_path
-                    for edge in self.graph
-                )
-            ]
+
+        # A path node is interesting when one of its edges leaves the path
+        on_path = np.zeros(self.adjacency.num_nodes, dtype=bool)
+        on_path[self.points_of_longest_path] = True
+        u, v = self.adjacency.edges[:, 0], self.adjacency.edges[:, 1]
+        branching = np.concatenate(
+            [u[on_path[u] & ~on_path[v]], v[on_path[v] & ~on_path[u]]]
+        )
+        points_of_interest = np.unique(branching).tolist()
+
         if len(points_of_interest) == 0:
             raise ValueError("No points of interest found.")
         else:
             return points_of_interest
+
+    def _measure_branches(self) -> tuple[dict[int, int], dict[int, int]]:
+        # Breadth first from every path node at once; each off-path node
+        # belongs to the branch of the path node that reaches it first.
+        offsets = self.adjacency.offsets.tolist()
+        neighbors = self.adjacency.neighbors.tolist()
+
+        owner = {node: node for node in self.points_of_longest_path}
+        depth = dict.fromkeys(self.points_of_longest_path, 0)
+        branch_depths = dict.fromkeys(self.points_of_interest, 0)
+        branch_sizes = dict.fromkeys(self.points_of_interest, 0)
+
+        frontier = self.points_of_longest_path
+        while frontier:
+            next_frontier = []
+            for node in frontier:
+                for i in range(offsets[node], offsets[node + 1]):
+                    neighbor = neighbors[i]
+                    if neighbor in owner:
+                        continue
+                    owner[neighbor] = owner[node]
+                    depth[neighbor] = depth[node] + 1
+                    branch_sizes[owner[neighbor]] += 1
+                    branch_depths[owner[neighbor]] = max(
+                        branch_depths[owner[neighbor]], depth[neighbor]
+                    )
+                    next_frontier.append(neighbor)
+            frontier = next_frontier
+
+        return branch_depths, branch_sizes
@@ -0,0 +1,191 @@
+# headless.py
+# Generates one dungeon and exports it, with no tcod window, tileset or
+# Engine, so dungeons can be built on servers and in containers without a
+# display.  The same seed and parameters give the same dungeon as
+# batch_generation.  Run it with python -m procedural_generator.headless.
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+import numpy as np
+
+from console_game_engine import tile_types
+from console_game_engine.entity import Entity
+from console_game_engine.game_map import GameMap
+from procedural_generator.batch_generation import DungeonParameters, build_dungeon
+from procedural_generator.dungeon_cache import CachedDungeon
+from procedural_generator.generation_strategies import STRATEGIES
+from procedural_generator.map_validation import REPAIR_MODES
+from procedural_generator.procedural_gen import DungeonLayout
+
+EXPORT_FORMATS = (".npz", ".json")
+
+
+@dataclass
+class HeadlessDungeon:
+    seed: int
+    parameters: DungeonParameters
+    game_map: GameMap
+    player: Entity
+    layout: DungeonLayout
+    # Seconds per stage, the generate_dungeon stages included
+    timings: dict[str, float]
+
+    def to_arrays(self) -> CachedDungeon:
+        # Tiles as uint8 indices into tile_types.tile_names, rooms in room_dt
+        # and every entity on the map in spawn_dt, the player first and the
+        # rest by position, since the map keeps them in a set
+        others = sorted(
+            (entity for entity in self.game_map.entities if entity is not self.player),
+            key=lambda entity: (entity.transform.x, entity.transform.y),
+        )
+        return CachedDungeon.from_generation(
+            self.game_map, self.layout.rooms, [self.player] + others
+        )
+
+    @property
+    def metadata(self) -> dict:
+        return {
+            "seed": self.seed,
+            "parameters": asdict(self.parameters),
+            "tile_names": list(tile_types.tile_names),
+            "unreachable_rooms": len(self.layout.reachability.unreachable_rooms),
+        }
+
+
+def generate(
+    seed: int, parameters: DungeonParameters = DungeonParameters()
+) -> HeadlessDungeon:
+    start_time = time.perf_counter()
+    game_map, player, layout = build_dungeon(seed, parameters)
+    total_time = time.perf_counter() - start_time
+
+    timings = dict(layout.timings)
+    # Map allocation, player placement and imports, everything outside the stages
+    timings["setup"] = total_time - sum(timings.values())
+    return HeadlessDungeon(seed, parameters, game_map, player, layout, timings)
+
+
+def export_npz(dungeon: HeadlessDungeon, path: str) -> None:
+    arrays = dungeon.to_arrays()
+    np.savez_compressed(
+        path,
+        tiles=arrays.tiles,
+        rooms=arrays.rooms,
+        entities=arrays.spawns,
+        metadata=np.array(json.dumps(dungeon.metadata)),
+    )
+
+
+def export_json(dungeon: HeadlessDungeon, path: str) -> None:
+    arrays = dungeon.to_arrays()
+    names = ("x", "y", "width", "height", "room_type")
+    document = dict(dungeon.metadata)
+    # One list per row, so tiles[y][x] is the tile at (x, y)
+    document["tiles"] = arrays.tiles.T.tolist()
+    document["rooms"] = [dict(zip(names, room)) for room in arrays.rooms.tolist()]
+    document["entities"] = [
+        dict(zip(("x", "y", "name"), entity)) for entity in arrays.spawns.tolist()
+    ]
+    with open(path, "w") as f:
+        json.dump(document, f)
+
+
+def export(dungeon: HeadlessDungeon, path: str) -> None:
+    """Writes the dungeon to path as .npz or .json, chosen by the extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Can not export to '{path}', the extension must be one of {EXPORT_FORMATS}."
+        )
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    if extension == ".npz":
+        export_npz(dungeon, path)
+    else:
+        export_json(dungeon, path)
+
+
+def format_timings(timings: dict[str, float]) -> str:
+    lines = [
+        f"{stage:<14}{seconds * 1000:>10.2f} ms" for stage, seconds in timings.items()
+    ]
+    lines.append(f"{'total':<14}{sum(timings.values()) * 1000:>10.2f} ms")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate a dungeon without a window and export it to .npz or .json."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--width", type=int, default=DungeonParameters.width)
+    parser.add_argument("--height", type=int, default=DungeonParameters.height)
+    parser.add_argument("--max-rooms", type=int, default=DungeonParameters.max_rooms)
+    parser.add_argument(
+        "--room-min-size", type=int, default=DungeonParameters.room_min_size
+    )
+    parser.add_argument(
+        "--room-max-size", type=int, default=DungeonParameters.room_max_size
+    )
+    parser.add_argument(
+        "--max-monsters-per-room",
+        type=int,
+        default=DungeonParameters.max_monsters_per_room,
+    )
+    parser.add_argument(
+        "--strategy", choices=sorted(STRATEGIES), default=DungeonParameters.strategy
+    )
+    parser.add_argument(
+        "--connectivity", choices=REPAIR_MODES, default=DungeonParameters.connectivity
+    )
+    parser.add_argument(
+        "--output",
+        nargs="*",
+        default=[],
+        help="Files to export the dungeon to, .npz or .json by extension",
+    )
+    args = parser.parse_args(argv)
+    for path in args.output:
+        if os.path.splitext(path)[1].lower() not in EXPORT_FORMATS:
+            parser.error(f"--output {path} must end in one of {EXPORT_FORMATS}")
+
+    parameters = DungeonParameters(
+        width=args.width,
+        height=args.height,
+        max_rooms=args.max_rooms,
+        room_min_size=args.room_min_size,
+        room_max_size=args.room_max_size,
+        max_monsters_per_room=args.max_monsters_per_room,
+        strategy=args.strategy,
+        connectivity=args.connectivity,
+    )
+    try:
+        dungeon = generate(args.seed, parameters)
+    except Exception as error:
+        # Reported like a failed seed in batch_generation, without a traceback
+        print(f"Seed {args.seed} failed: {type(error).__name__}: {error}")
+        return 1
+
+    for path in args.output:
+        start_time = time.perf_counter()
+        export(dungeon, path)
+        dungeon.timings[f"export {os.path.splitext(path)[1]}"] = (
+            time.perf_counter() - start_time
+        )
+
+    print(
+        f"Seed {args.seed}: {len(dungeon.layout.rooms)} rooms, "
+        f"{len(dungeon.game_map.entities)} entities, "
+        f"{len(dungeon.layout.reachability.unreachable_rooms)} unreachable rooms"
+    )
+    print(format_timings(dungeon.timings))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
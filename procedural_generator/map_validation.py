@@ -0,0 +1,173 @@
+# map_validation.py
+# Checks that a generated dungeon can actually be walked.  The walkable tiles
+# are split into connected components with one scipy labelling pass, and every
+# room and entity is looked up in the labels to find the ones the player can
+# not reach.  Unreachable islands can then be pruned, or reconnected with
+# tunnels to the nearest reachable floor.
+import logging
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+from scipy import ndimage
+
+from console_game_engine import tile_types
+from console_game_engine.entity import Entity
+from console_game_engine.game_map import GameMap
+from procedural_generator.room_generation import RoomSet, l_shaped_tunnels
+
+map_validation_logger = logging.getLogger("procedural_gen")
+
+# Entities only move up, down, left and right, so diagonal neighbours are not
+# connected; this is the default structuring element of ndimage.label
+CONNECTIVITY = ndimage.generate_binary_structure(2, 1)
+
+REPAIR_MODES = ("report", "prune", "reconnect")
+
+
+@dataclass
+class ReachabilityReport:
+    # (width, height) component label of every cell, 0 where it is not walkable
+    labels: np.ndarray
+    component_count: int
+    # Label of the component holding the start position, 0 if it is a wall
+    start_label: int
+    # Indices into the rooms that were checked
+    unreachable_rooms: list[int]
+    unreachable_entities: list[Entity]
+
+    @property
+    def reachable(self) -> np.ndarray:
+        # Every label is positive, so a start on a wall reaches nothing
+        return (self.labels == self.start_label) & (self.start_label != 0)
+
+    @property
+    def is_connected(self) -> bool:
+        return not self.unreachable_rooms and not self.unreachable_entities
+
+    def __str__(self) -> str:
+        return (
+            f"ReachabilityReport with {self.component_count} walkable components, "
+            f"{len(self.unreachable_rooms)} unreachable rooms and "
+            f"{len(self.unreachable_entities)} unreachable entities"
+        )
+
+
+def check_reachability(
+    game_map: GameMap,
+    rooms: RoomSet,
+    start: tuple[int, int],
+    entities: Optional[Iterable[Entity]] = None,
+) -> ReachabilityReport:
+    """
+    Labels the walkable components of game_map and reports the rooms and entities that are not in the component holding start.  A room is reachable when any floor cell inside its walls is, so a room without floor is unreachable.  entities defaults to every entity on the map.
+    """
+    labels, component_count = ndimage.label(
+        game_map.tiles["walkable"], structure=CONNECTIVITY
+    )
+    start_x, start_y = start
+    start_label = (
+        int(labels[start_x, start_y]) if game_map.in_bounds(start_x, start_y) else 0
+    )
+
+    room_of_cell, xs, ys = rooms.cells(game_map.width, game_map.height, "inner")
+    reached = np.zeros(len(rooms), dtype=bool)
+    if start_label:
+        reached[room_of_cell[labels[xs, ys] == start_label]] = True
+
+    if entities is None:
+        entities = game_map.entities
+    unreachable_entities = [
+        entity
+        for entity in entities
+        if not start_label
+        or not game_map.in_bounds(entity.transform.x, entity.transform.y)
+        or labels[entity.transform.x, entity.transform.y] != start_label
+    ]
+
+    return ReachabilityReport(
+        labels=labels,
+        component_count=component_count,
+        start_label=start_label,
+        unreachable_rooms=np.flatnonzero(~reached).tolist(),
+        unreachable_entities=unreachable_entities,
+    )
+
+
+def prune_unreachable(game_map: GameMap, report: ReachabilityReport) -> None:
+    """
+    Walls in every walkable cell outside the reachable component and removes the entities the report found unreachable from the map.
+    """
+    if not report.start_label:
+        raise ValueError("Can not prune a map whose start position is not walkable.")
+    game_map.set_tiles(
+        (report.labels != 0) & ~report.reachable, tile_types.tile_types["wall"]
+    )
+    for entity in report.unreachable_entities:
+        game_map.remove_entity(entity)
+
+
+def reconnect_unreachable(
+    game_map: GameMap, report: ReachabilityReport, tunnel_width: int = 1
+) -> RoomSet:
+    """
+    Digs an L shaped tunnel from every unreachable component to the nearest reachable floor and returns the tunnels.  One taxicab distance transform finds the nearest reachable cell for every cell, and each component starts its tunnel from its own cell closest to the reachable area, so the tunnels are as short as an L shape allows.
+    """
+    if not report.start_label:
+        raise ValueError(
+            "Can not reconnect a map whose start position is not walkable."
+        )
+    islands = np.setdiff1d(
+        np.arange(1, report.component_count + 1), [report.start_label]
+    )
+    if len(islands) == 0:
+        return RoomSet.empty()
+
+    # An L shaped tunnel is as long as the taxicab distance it covers
+    distances, (nearest_x, nearest_y) = ndimage.distance_transform_cdt(
+        ~report.reachable, metric="taxicab", return_indices=True
+    )
+    x1, y1 = np.array(
+        ndimage.minimum_position(distances, report.labels, islands), dtype=np.intp
+    ).T
+    tunnels = l_shaped_tunnels(
+        x1,
+        y1,
+        nearest_x[x1, y1],
+        nearest_y[x1, y1],
+        tunnel_width,
+        ("Repair Tunnel", "Repair Tunnel"),
+    )
+    game_map.carve_rectangles(*tunnels.bounds("outer"))
+    return tunnels
+
+
+def validate_connectivity(
+    game_map: GameMap,
+    rooms: RoomSet,
+    start: tuple[int, int],
+    repair: str = "report",
+) -> tuple[ReachabilityReport, RoomSet, RoomSet]:
+    """
+    Checks the map and, when repair is "prune" or "reconnect", fixes it and checks it again.  Returns the report for the map as it is left, the rooms that are left on it, and the tunnels dug by "reconnect".  With "report" the map is not changed, and nothing is repaired when the start position itself is not walkable.
+    """
+    if repair not in REPAIR_MODES:
+        raise ValueError(f"repair must be one of {REPAIR_MODES}, not '{repair}'.")
+
+    report = check_reachability(game_map, rooms, start)
+    if report.is_connected:
+        return report, rooms, RoomSet.empty()
+    if repair == "report" or not report.start_label:
+        map_validation_logger.debug(str(report))
+        return report, rooms, RoomSet.empty()
+
+    map_validation_logger.debug(f"{report}, repairing with '{repair}'")
+    tunnels = RoomSet.empty()
+    if repair == "prune":
+        prune_unreachable(game_map, report)
+        kept = np.ones(len(rooms), dtype=bool)
+        kept[report.unreachable_rooms] = False
+        rooms = rooms[kept]
+    else:
+        tunnels = reconnect_unreachable(game_map, report)
+    return check_reachability(game_map, rooms, start), rooms, tunnels
@@ -1,36 +1,123 @@
 import numpy as np
+from scipy.spatial import QhullError
+from scipy.spatial.distance import pdist, squareform
+
+from procedural_generator.point_validation import (
+    ValidatedPoints,
+    trusted_points,
+    validate_points,
+)
+from procedural_generator.triangulator import (
+    DelaunayTriangulationAlgorithm,
+    Triangulator,
+)
+
+MST_ALGORITHMS = ("prim", "delaunay_kruskal")
+
+
+class DisjointSet:
+    """Union-find with path halving and union by size."""
+
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> bool:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return True
 
 
 class MinimumSpanningTreeFinder:
-    def __init__(self, points: list[tuple[int, int]]) -> None:
-        if not all(isinstance(p, tuple) for p in points):
-            raise TypeError("Points must be tuples.")
-        if len(points) < 3:
-            raise ValueError(
-                "At least three points are required to compute Delaunay triangulation."
-            )
-        if len(set(points)) != len(points):
-            raise ValueError("Duplicate points are not allowed.")
-
-        self.points = points
+    def __init__(
+        self,
+        points: list[tuple[int, int]],
+        algorithm: str = "prim",
+        dtype: np.dtype = np.float64,
+        trusted: bool = False,
+    ) -> None:
+        self.validated_points = (
+            trusted_points(points) if trusted else validate_points(points)
+        )
+        if algorithm not in MST_ALGORITHMS:
+            raise ValueError(f"Algorithm must be one of {MST_ALGORITHMS}.")
+
+        self.points = points.array if isinstance(points, ValidatedPoints) else points
+        self.algorithm = algorithm
+        self.dtype = np.dtype(dtype)
         self.num_points = len(self.points)
 
     @property
-    def compute_weights(self):
-        # for every point, compute the distance to every other point and store in a matrix
-        weights = np.zeros((self.num_points, self.num_points))
-        for i in range(self.num_points):
-            for j in range(i + 1, self.num_points):
-                dist = np.sqrt(
-                    (self.points[i][0] - self.points[j][0]) ** 2
-                    + (self.points[i][1] - self.points[j][1]) ** 2
-                )
-                weights[i][j] = dist
-                weights[j][i] = dist
-        return weights
+    def condensed_weights(self) -> np.ndarray:
+        # Upper triangle of the distance matrix, in the order of np.triu_indices(n, 1)
+        if not hasattr(self, "_condensed_weights"):
+            self._condensed_weights = pdist(
+                np.asarray(self.points, dtype=np.float64)
+            ).astype(self.dtype, copy=False)
+        return self._condensed_weights
+
+    @property
+    def compute_weights(self) -> np.ndarray:
+        # for every point, the distance to every other point as a square matrix
+        if not hasattr(self, "_weights"):
+            self._weights = squareform(self.condensed_weights, checks=False)
+        return self._weights
+
+    def weight(self, i: int, j: int) -> float:
+        if i == j:
+            return 0.0
+        i, j = min(i, j), max(i, j)
+        n = self.num_points
+        return self.condensed_weights[n * i - i * (i + 1) // 2 + (j - i - 1)]
 
     @property
     def minimum_spanning_tree(self) -> list[tuple[int, int]]:
+        if self.algorithm == "delaunay_kruskal":
+            return self._delaunay_kruskal()
+        return self._prim()
+
+    def _delaunay_kruskal(self) -> list[tuple[int, int]]:
+        # The Euclidean MST is a subgraph of the Delaunay triangulation, so
+        # Kruskal only has to consider its O(n) edges instead of all O(n^2) pairs.
+        points = self.validated_points.array
+        try:
+            # The triangulator only runs the checks the MST did not already do
+            edges = Triangulator(
+                self.validated_points, DelaunayTriangulationAlgorithm()
+            ).edges
+        except (TypeError, ValueError, QhullError):
+            # Points the triangulator rejects (non-integer, negative, collinear
+            # or otherwise degenerate) fall back to the dense algorithm.
+            return self._prim()
+
+        # Already ordered by (smaller index, larger index), which fixes the
+        # order of equal length edges in the stable sort below
+        edges = np.sort(edges, axis=1)
+        deltas = (points[edges[:, 0]] - points[edges[:, 1]]).astype(np.float64)
+        order = np.argsort(np.hypot(deltas[:, 0], deltas[:, 1]), kind="stable")
+
+        mst = []
+        components = DisjointSet(self.num_points)
+        for u, v in edges[order].tolist():
+            if components.union(u, v):
+                mst.append((u, v))
+                if len(mst) == self.num_points - 1:
+                    break
+        return mst
+
+    def _prim(self) -> list[tuple[int, int]]:
         # use Prim's algorithm to find the minimum spanning tree
         mst = []
         edges = set()
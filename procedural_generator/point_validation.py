@@ -0,0 +1,99 @@
+# point_validation.py
+# The triangulator and the minimum spanning tree both need a list of distinct
+# 2D points.  The checks are done here once, with numpy, and the result is a
+# ValidatedPoints token that later stages accept without checking again.
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class ValidatedPoints:
+    """
+    Points that passed validate_points, as a read only (n, 2) array.  The flags record which of the optional checks have been run and passed, so a stage that needs one more check only runs that one.
+    """
+
+    array: np.ndarray
+    integer: bool = False
+    non_negative: bool = False
+    non_collinear: bool = False
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def tuples(self) -> list[tuple]:
+        return list(map(tuple, self.array.tolist()))
+
+
+def validate_points(
+    points,
+    integer: bool = False,
+    non_negative: bool = False,
+    non_collinear: bool = False,
+) -> ValidatedPoints:
+    """
+    Checks that points is a sequence of at least three distinct (x, y) pairs, plus the optional checks asked for, and returns a ValidatedPoints token.  Raises TypeError for anything that is not an (n, 2) array of numbers, and ValueError for too few, duplicate, negative or collinear points.  Passing a token back in only runs the checks it has not passed yet.
+    """
+    if isinstance(points, ValidatedPoints):
+        validated = points
+    else:
+        validated = ValidatedPoints(_as_point_array(points))
+
+    array = validated.array
+    if integer and not validated.integer:
+        if not np.issubdtype(array.dtype, np.integer):
+            raise TypeError("Points must be integers.")
+    if non_negative and not validated.non_negative:
+        if (array < 0).any():
+            raise ValueError("Points must be non-negative.")
+    if non_collinear and not validated.non_collinear:
+        if _collinear(array):
+            raise ValueError("Points must not be in a line.")
+
+    return replace(
+        validated,
+        integer=validated.integer or integer,
+        non_negative=validated.non_negative or non_negative,
+        non_collinear=validated.non_collinear or non_collinear,
+    )
+
+
+def trusted_points(points) -> ValidatedPoints:
+    """Wraps points that the caller vouches for in a token without checking them."""
+    if isinstance(points, ValidatedPoints):
+        return points
+    return ValidatedPoints(
+        np.asarray(points), integer=True, non_negative=True, non_collinear=True
+    )
+
+
+def _as_point_array(points) -> np.ndarray:
+    try:
+        array = np.array(points)
+    except ValueError:
+        # Ragged input, such as a bare number among the pairs
+        raise TypeError("Points must be (x, y) pairs.") from None
+    if array.size == 0:
+        raise ValueError("At least three points are required.")
+    if array.ndim != 2 or array.shape[1] != 2:
+        raise TypeError("Points must be (x, y) pairs.")
+    if array.dtype == bool or not (
+        np.issubdtype(array.dtype, np.integer)
+        or np.issubdtype(array.dtype, np.floating)
+    ):
+        raise TypeError("Points must be numbers.")
+    if len(array) < 3:
+        raise ValueError("At least three points are required.")
+    if len(np.unique(array, axis=0)) != len(array):
+        raise ValueError("Duplicate points are not allowed.")
+    array.flags.writeable = False
+    return array
+
+
+def _collinear(array: np.ndarray) -> bool:
+    # Every point is on the line through the first point and the first one
+    # that differs from it when all the cross products with it are zero
+    deltas = array - array[0]
+    direction = deltas[np.flatnonzero(deltas.any(axis=1))[0]]
+    cross = deltas[:, 0] * direction[1] - deltas[:, 1] * direction[0]
+    return not cross.any()
@@ -1,23 +1,59 @@
 # procedual_gen.py
 import logging
-import random
+import logging.config
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
 import yaml
 
 from console_game_engine import entity_factories
 from console_game_engine.colors import colors
 from console_game_engine.entity import Entity
 from console_game_engine.game_map import GameMap
-from procedural_generator.generation_strategies import longest_path_in_mst_strategy
+from procedural_generator.generation_strategies import get_strategy
 from procedural_generator.graph_explorer import GraphExplorer
 from procedural_generator.minimum_spanning_tree_finder import MinimumSpanningTreeFinder
 
 
-from .room_generation import RectangularRoom, RoomGenerator
+from .map_validation import ReachabilityReport, validate_connectivity
+from .room_generation import RoomGenerator, RoomSet
+from .spawn_planner import plan_spawns
+
+# logging.yaml sits at the repository root; the generator is also run from
+# other directories, such as the headless CLI on a build server
+LOGGING_CONFIG = Path(__file__).resolve().parent.parent / "logging.yaml"
+
+
+def setup_procedural_gen_logging() -> logging.Logger:
+    # Without the config file the logger keeps Python's defaults.  The log
+    # file paths in it are relative to the repository root, not the current
+    # directory, and their directories are created on first use
+    if LOGGING_CONFIG.exists():
+        with open(LOGGING_CONFIG, "rt") as f:
+            config = yaml.safe_load(f.read())
+        for handler in config.get("handlers", {}).values():
+            if "filename" in handler:
+                filename = LOGGING_CONFIG.parent / handler["filename"]
+                filename.parent.mkdir(parents=True, exist_ok=True)
+                handler["filename"] = str(filename)
+        logging.config.dictConfig(config)
+    return logging.getLogger("procedural_gen")
+
 
-with open("logging.yaml", "rt") as f:
-    config = yaml.safe_load(f.read())
-    logging.config.dictConfig(config)
-procedrual_gen_logger = logging.getLogger("procedural_gen")
+procedrual_gen_logger = setup_procedural_gen_logging()
+
+
+@dataclass
+class DungeonLayout:
+    rooms: RoomSet
+    tunnels: RoomSet
+    monsters: list[Entity]
+    # Which rooms and entities the player can not walk to, after any repair
+    reachability: ReachabilityReport = None
+    # Seconds spent in each stage of generate_dungeon, in stage order
+    timings: dict[str, float] = field(default_factory=dict)
 
 
 # This is the function that actualy generates the dungeon
@@ -29,23 +65,30 @@ def generate_dungeon(
     player: Entity,
     max_monsters_per_room=3,
     max_items_per_room=2,
-):
-    dungeon_width = game_map.width
-    dungeon_height = game_map.height
+    strategy="longest_path_in_mst",
+    rng: np.random.Generator = None,
+    connectivity: str = "report",
+) -> DungeonLayout:
+    # strategy is a name registered in generation_strategies, or a function
+    # with the same signature.  connectivity is "report" to only check that
+    # every room can be walked to, or "prune" or "reconnect" to also fix the
+    # rooms that can not, see map_validation.validate_connectivity
+    rng = np.random.default_rng(rng)
+    timings = {}
+    start_time = time.perf_counter()
 
     procedrual_gen_logger.debug("Generating dungeom using room and tunnel gen...\n")
 
-    # rooms, tunnels = basic_generation_strategy(
-    #     game_map, max_rooms, room_min_size, room_max_size, player_transform)
-
-    rooms, tunnels = longest_path_in_mst_strategy(
-        dungeon_width=dungeon_width,
-        dungeon_height=dungeon_height,
+    # The strategy carves the rooms and tunnels into game_map
+    rooms, tunnels = get_strategy(strategy)(
+        game_map=game_map,
         max_rooms=max_rooms,
+        player_transform=player.transform,
         room_min_size=room_min_size,
         room_max_size=room_max_size,
-        player_transform=player.transform,
+        rng=rng,
     )
+    timings["strategy"] = time.perf_counter() - start_time
     # A string that is a list of all the rooms and tunnels sepertaed by a new line
     rooms_str = "\n".join(str(room) for room in rooms)
     tunnels_str = "\n".join(str(tunnel) for tunnel in tunnels)
@@ -54,39 +97,36 @@ def generate_dungeon(
         f"\n\nRooms: \n{rooms_str}" f"\n\nTunnels:\n{tunnels_str}\n"
     )
 
-    procedrual_gen_logger.debug("Rendering rooms and tunnels...\n")
-    for room in rooms:
-        game_map.add_room_to_game_map(room, tile_type="floor", slice_type="inner")
-    for tunnel in tunnels:
-        game_map.add_room_to_game_map(tunnel, tile_type="floor", slice_type="outer")
+    start_time = time.perf_counter()
+    monsters = generate_monsters(game_map, rooms, max_monsters_per_room, rng)
+    timings["monsters"] = time.perf_counter() - start_time
 
-    monsters = generate_monsters(game_map, rooms, max_monsters_per_room)
-
-    for monster in monsters:
-        game_map.entities.add(monster)
+    start_time = time.perf_counter()
+    reachability, rooms, repair_tunnels = validate_connectivity(
+        game_map,
+        rooms,
+        (player.transform.x, player.transform.y),
+        repair=connectivity,
+    )
+    if connectivity == "prune":
+        monsters = [monster for monster in monsters if monster in game_map.entities]
+    timings["connectivity"] = time.perf_counter() - start_time
+
+    return DungeonLayout(
+        rooms,
+        RoomSet.concatenate([tunnels, repair_tunnels]),
+        monsters,
+        reachability,
+        timings,
+    )
 
 
 def generate_monsters(
-    game_map: GameMap, rooms: list[RectangularRoom], max_monster_per_room: int
+    game_map: GameMap,
+    rooms: RoomSet,
+    max_monster_per_room: int,
+    rng: np.random.Generator = None,
 ) -> list[Entity]:
-    monsters = []
-    for room in rooms:
-        if room.room_type == "Spawn_Room":
-            continue
-
-        number_of_monsters = random.randint(0, max_monster_per_room)
-        for _ in range(number_of_monsters):
-            x, y = find_point_in_room(room)
-
-            if random.random() < 0.8:
-                entity_factories.orc.spawn(game_map, x, y)
-            else:
-                entity_factories.troll.spawn(game_map, x, y)
-
-    return monsters
-
-
-def find_point_in_room(room):
-    x = random.randint(room.x1 + 1, room.x2 - 1)
-    y = random.randint(room.y1 + 1, room.y2 - 1)
-    return x, y
+    # Every room is planned at once, and no two monsters share a cell
+    plan = plan_spawns(game_map, rooms, max_monster_per_room, rng)
+    return plan.materialize(game_map)
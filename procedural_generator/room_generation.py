@@ -1,7 +1,9 @@
 # room_generation.py
-import random
+from typing import Iterable, Iterator
 from venv import create
 
+import numpy as np
+
 # This file contains the code for generating the rooms and tunnels for the dungeon
 # A class that represents a room in the dungeon
 
@@ -52,21 +54,284 @@ class RectangularRoom:
         )
 
 
-class RoomGenerator:
-    def generate_tunnels(
-        self, tunnel_width: int, rooms: list[RectangularRoom]
-    ) -> list[RectangularRoom]:
-        tunnels = []
+class RoomSet:
+    """
+    Struct of arrays collection of rooms, the form rooms and tunnels are passed between the generation stages in.  The bounds and types live in parallel numpy arrays, so centers, slices masks and intersection tests are computed for every room at once, and a thousand rooms cost a few kilobytes instead of a thousand Python objects.  Indexing with an int or iterating gives RectangularRoom objects, and from_rooms and to_rooms convert for the code that still works room by room.
+    """
+
+    def __init__(self, x1, y1, x2, y2, room_types=None) -> None:
+        self.x1 = np.asarray(x1, dtype=np.int32).ravel()
+        self.y1 = np.asarray(y1, dtype=np.int32).ravel()
+        self.x2 = np.asarray(x2, dtype=np.int32).ravel()
+        self.y2 = np.asarray(y2, dtype=np.int32).ravel()
+        if not len(self.x1) == len(self.y1) == len(self.x2) == len(self.y2):
+            raise ValueError("Room bounds must all have the same length.")
+        if room_types is None:
+            room_types = ["default"] * len(self.x1)
+        self.room_types = np.asarray(room_types, dtype=str).ravel()
+        if len(self.room_types) != len(self.x1):
+            raise ValueError("There must be one room type per room.")
+
+    @classmethod
+    def from_rooms(cls, rooms: list[RectangularRoom]) -> "RoomSet":
+        bounds = np.array(
+            [(room.x1, room.y1, room.x2, room.y2) for room in rooms], dtype=np.int32
+        ).reshape(-1, 4)
+        return cls(*bounds.T, room_types=[room.room_type for room in rooms])
+
+    @classmethod
+    def empty(cls) -> "RoomSet":
+        return cls([], [], [], [], [])
+
+    @classmethod
+    def concatenate(cls, room_sets: Iterable["RoomSet"]) -> "RoomSet":
+        room_sets = [cls.empty()] + list(room_sets)
+        return cls(
+            *(
+                np.concatenate([getattr(room_set, name) for room_set in room_sets])
+                for name in ("x1", "y1", "x2", "y2")
+            ),
+            room_types=np.concatenate([room_set.room_types for room_set in room_sets]),
+        )
 
-        if len(rooms) <= 1:
-            return tunnels
-        for room1, room2 in zip(rooms, rooms[1:]):
-            tunnel_pair = self.create_horizontal_and_verticle_tunnel(
-                room1, room2, tunnel_width
+    def to_rooms(self) -> list[RectangularRoom]:
+        return [self[i] for i in range(len(self))]
+
+    def __len__(self) -> int:
+        return len(self.x1)
+
+    def __iter__(self) -> Iterator[RectangularRoom]:
+        return (self[i] for i in range(len(self)))
+
+    def __getitem__(self, index):
+        # An int gives that room as a RectangularRoom; a slice, an index array
+        # or a boolean mask gives those rooms as a RoomSet
+        if not isinstance(index, (int, np.integer)):
+            return RoomSet(
+                self.x1[index],
+                self.y1[index],
+                self.x2[index],
+                self.y2[index],
+                self.room_types[index],
             )
-            tunnels.append(tunnel_pair[0])
-            tunnels.append(tunnel_pair[1])
-        return tunnels
+        return RectangularRoom(
+            int(self.x1[index]),
+            int(self.y1[index]),
+            int(self.x2[index] - self.x1[index]),
+            int(self.y2[index] - self.y1[index]),
+            str(self.room_types[index]),
+        )
+
+    @property
+    def widths(self) -> np.ndarray:
+        return self.x2 - self.x1
+
+    @property
+    def heights(self) -> np.ndarray:
+        return self.y2 - self.y1
+
+    @property
+    def centers(self) -> np.ndarray:
+        # (n, 2) array, truncated toward zero like RectangularRoom.center
+        return np.stack(
+            [
+                ((self.x1 + self.x2) / 2).astype(np.int64),
+                ((self.y1 + self.y2) / 2).astype(np.int64),
+            ],
+            axis=1,
+        )
+
+    @property
+    def center_points(self) -> list[tuple[int, int]]:
+        return [tuple(center) for center in self.centers.tolist()]
+
+    def bounds(
+        self, slice_type: str = "outer"
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # Half open x1, y1, x2, y2 of the RectangularRoom.inner or outer slices
+        if slice_type == "inner":
+            return self.x1 + 1, self.y1 + 1, self.x2, self.y2
+        elif slice_type == "outer":
+            return self.x1, self.y1, self.x2, self.y2
+        raise ValueError("slice_type must be 'inner' or 'outer'.")
+
+    def mask(self, width: int, height: int, slice_type: str = "outer") -> np.ndarray:
+        return rectangles_mask(width, height, *self.bounds(slice_type))
+
+    def cells(
+        self, width: int, height: int, slice_type: str = "outer"
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Every cell of every room, clipped to the map, as three flat arrays: the index of the room the cell belongs to, and the cell's x and y.  Cells come room by room in room order, and within a room column by column.  A cell shared by two rooms appears once for each.
+        """
+        x1, y1, x2, y2 = self.bounds(slice_type)
+        x1, x2 = np.clip(x1, 0, width), np.clip(x2, 0, width)
+        y1, y2 = np.clip(y1, 0, height), np.clip(y2, 0, height)
+        heights = np.maximum(y2 - y1, 0)
+        areas = np.maximum(x2 - x1, 0) * heights
+        room_of_cell = np.repeat(np.arange(len(self)), areas)
+        local = np.arange(areas.sum()) - np.repeat(np.cumsum(areas) - areas, areas)
+        xs = x1[room_of_cell] + local // heights[room_of_cell]
+        ys = y1[room_of_cell] + local % heights[room_of_cell]
+        return room_of_cell, xs, ys
+
+    def intersects(self, room: RectangularRoom) -> np.ndarray:
+        # Which rooms intersect the given room, inclusive like RectangularRoom.intersects
+        return (
+            (self.x1 <= room.x2)
+            & (self.x2 >= room.x1)
+            & (self.y1 <= room.y2)
+            & (self.y2 >= room.y1)
+        )
+
+    def pairwise_intersections(self) -> np.ndarray:
+        # (n, n) boolean matrix, true where rooms i and j intersect; the diagonal is true
+        return (
+            (self.x1[:, None] <= self.x2[None, :])
+            & (self.x2[:, None] >= self.x1[None, :])
+            & (self.y1[:, None] <= self.y2[None, :])
+            & (self.y2[:, None] >= self.y1[None, :])
+        )
+
+    def intersecting_pairs(self) -> np.ndarray:
+        # (k, 2) array of the index pairs i < j of intersecting rooms
+        return np.argwhere(np.triu(self.pairwise_intersections(), k=1))
+
+
+def l_shaped_tunnels(
+    x1: np.ndarray,
+    y1: np.ndarray,
+    x2: np.ndarray,
+    y2: np.ndarray,
+    tunnel_width: int = 1,
+    room_types: tuple[str, str] = ("Horzontal Tunnel", "Vertical Tunnel"),
+) -> RoomSet:
+    """
+    A horizontal tunnel along y1 from x1 to x2 followed by a vertical one along x2 from y1 to y2 for every pair of points, like RoomGenerator.create_horizontal_and_verticle_tunnel, as one RoomSet with the two tunnels of each pair next to each other.
+    """
+    x1, y1, x2, y2 = (np.asarray(a, dtype=np.int32) for a in (x1, y1, x2, y2))
+    horizontal = (np.minimum(x1, x2), y1, np.maximum(x1, x2) + 1, y1 + tunnel_width)
+    vertical = (x2, np.minimum(y1, y2), x2 + tunnel_width, np.maximum(y1, y2) + 1)
+    return RoomSet(
+        *(np.stack(pair, axis=1).ravel() for pair in zip(horizontal, vertical)),
+        room_types=np.tile(room_types, len(x1)),
+    )
+
+
+def rectangles_mask(
+    width: int,
+    height: int,
+    x1: np.ndarray,
+    y1: np.ndarray,
+    x2: np.ndarray,
+    y2: np.ndarray,
+) -> np.ndarray:
+    """
+    Boolean (width, height) mask of the cells covered by any of the half open rectangles [x1, x2) x [y1, y2), clipped to the map.  Each rectangle only touches its four corners of a difference array, and two cumulative sums turn the corners back into coverage counts, so the cost does not depend on the size or number of the rectangles beyond one pass over the map.
+    """
+    x1 = np.clip(x1, 0, width)
+    x2 = np.clip(x2, 0, width)
+    y1 = np.clip(y1, 0, height)
+    y2 = np.clip(y2, 0, height)
+    keep = (x1 < x2) & (y1 < y2)
+    x1, y1, x2, y2 = x1[keep], y1[keep], x2[keep], y2[keep]
+
+    difference = np.zeros((width + 1, height + 1), dtype=np.int32)
+    np.add.at(difference, (x1, y1), 1)
+    np.add.at(difference, (x2, y1), -1)
+    np.add.at(difference, (x1, y2), -1)
+    np.add.at(difference, (x2, y2), 1)
+    coverage = difference.cumsum(axis=0).cumsum(axis=1)
+    return coverage[:width, :height] > 0
+
+
+class OccupancyGrid:
+    """
+    Boolean mask of the map cells covered by placed rooms.  Rooms cover their bounds inclusively, matching RectangularRoom.intersects, and are clipped to the map, so an overlap test only reads the cells under the candidate room no matter how many rooms have been placed.
+
+    Given a footprint, the grid also tracks every top-left position where a room of that size still fits, so placement can sample free positions directly instead of rejecting draws.
+    """
+
+    def __init__(
+        self, width: int, height: int, footprint: tuple[int, int] = None
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.mask = np.zeros((width, height), dtype=bool)
+        self.footprint = footprint
+        if footprint is not None:
+            # Positions past these bounds would push the room off the map
+            self.open_positions = np.zeros((width, height), dtype=bool)
+            self.open_positions[
+                : max(width - footprint[0], 0), : max(height - footprint[1], 0)
+            ] = True
+
+    def mark(self, room: RectangularRoom) -> None:
+        x1, x2 = max(room.x1, 0), min(room.x2, self.width - 1)
+        y1, y2 = max(room.y1, 0), min(room.y2, self.height - 1)
+        if x1 > x2 or y1 > y2:
+            return
+        self.mask[x1 : x2 + 1, y1 : y2 + 1] = True
+        if self.footprint is not None:
+            # A footprint-sized room at (x, y) covers x..x + width, so every
+            # position up to width cells before this room now overlaps it.
+            width, height = self.footprint
+            self.open_positions[
+                max(x1 - width, 0) : x2 + 1, max(y1 - height, 0) : y2 + 1
+            ] = False
+
+    def is_free(self, room: RectangularRoom) -> bool:
+        x1, x2 = max(room.x1, 0), min(room.x2, self.width - 1)
+        y1, y2 = max(room.y1, 0), min(room.y2, self.height - 1)
+        if x1 > x2 or y1 > y2:
+            return True
+        return not self.mask[x1 : x2 + 1, y1 : y2 + 1].any()
+
+    def sample_open_position(
+        self, rng: np.random.Generator, probes: int = 8
+    ) -> tuple[int, int]:
+        # Cheap uniform probes first; once the map is mostly full, fall back to
+        # choosing among the remaining open positions directly.  Returns None
+        # once no footprint-sized room fits anywhere.
+        for _ in range(probes):
+            x, y = rng.integers((self.width, self.height)).tolist()
+            if self.open_positions[x, y]:
+                return x, y
+
+        candidates = np.flatnonzero(self.open_positions)
+        if len(candidates) == 0:
+            return None
+        x, y = np.unravel_index(
+            candidates[rng.integers(len(candidates))], self.open_positions.shape
+        )
+        return int(x), int(y)
+
+
+class RoomGenerator:
+    def __init__(self, rng: np.random.Generator = None) -> None:
+        self.rng = np.random.default_rng(rng)
+
+    def generate_tunnels(self, tunnel_width: int, rooms: RoomSet) -> RoomSet:
+        # Joins every room to the next one in the set
+        return self.tunnels_between(
+            rooms, np.arange(len(rooms) - 1), np.arange(1, len(rooms)), tunnel_width
+        )
+
+    def tunnels_between(
+        self,
+        rooms: RoomSet,
+        starting_rooms: np.ndarray,
+        ending_rooms: np.ndarray,
+        tunnel_width=1,
+    ) -> RoomSet:
+        # The tunnels of create_horizontal_and_verticle_tunnel from the center
+        # of every starting room to the center of its ending room, as pairs
+        centers = rooms.centers
+        starts = centers[np.asarray(starting_rooms, dtype=np.intp)]
+        ends = centers[np.asarray(ending_rooms, dtype=np.intp)]
+        return l_shaped_tunnels(
+            starts[:, 0], starts[:, 1], ends[:, 0], ends[:, 1], tunnel_width
+        )
 
     def create_horizontal_and_verticle_tunnel(
         self,
@@ -95,25 +360,43 @@ class RoomGenerator:
         room_max_size: int,
         spawn_x: int,
         spawn_y: int,
-    ) -> list[RectangularRoom]:
-        new_rooms = []
+        sample_free_positions: bool = False,
+    ) -> RoomSet:
+        # Bounds of the rooms placed so far, collected for one RoomSet at the end
+        bounds = []
+        occupancy = OccupancyGrid(
+            map_width,
+            map_height,
+            (room_max_size, room_max_size) if sample_free_positions else None,
+        )
 
         spawn_room = self.create_spawn_room(spawn_x, spawn_y)
-        new_rooms.append(spawn_room)
+        bounds.append((spawn_room.x1, spawn_room.y1, spawn_room.x2, spawn_room.y2))
+        occupancy.mark(spawn_room)
 
+        max_x = map_width - room_max_size - 1
+        max_y = map_height - room_max_size - 1
         for _ in range(max_rooms):
-            x = random.randint(0, map_width - room_max_size - 1)
-            y = random.randint(0, map_height - room_max_size - 1)
-            w = random.randint(room_min_size, room_max_size)
-            h = random.randint(room_min_size, room_max_size)
+            if sample_free_positions:
+                # Only draw from positions where even the largest room still fits
+                position = occupancy.sample_open_position(self.rng)
+                if position is None:
+                    break
+                x, y = position
+                w, h = self.rng.integers(room_min_size, room_max_size + 1, 2).tolist()
+            else:
+                x, y = self.rng.integers(0, (max_x + 1, max_y + 1)).tolist()
+                w, h = self.rng.integers(room_min_size, room_max_size + 1, 2).tolist()
 
             new_room = RectangularRoom(x, y, w, h, "Basic_Room")
-            if any(other_room.intersects(new_room) for other_room in new_rooms):
+            if not occupancy.is_free(new_room):
                 continue
             else:
-                new_rooms.append(new_room)
+                bounds.append((new_room.x1, new_room.y1, new_room.x2, new_room.y2))
+                occupancy.mark(new_room)
 
-        return new_rooms
+        room_types = [spawn_room.room_type] + ["Basic_Room"] * (len(bounds) - 1)
+        return RoomSet(*np.array(bounds, dtype=np.int32).T, room_types=room_types)
 
     # this function creates the spawn room
     def create_spawn_room(self, x, y, spawn_room_size: int = 6) -> RectangularRoom:
@@ -0,0 +1,107 @@
+# spawn_planner.py
+# Plans where monsters go for every room at once.  Positions are sampled from
+# the floor cells inside each room with numpy, cells already taken are never
+# reused, and the kind of every monster comes from one draw on a weighted
+# spawn table.  The plan is plain arrays, turned into entities in one pass.
+from dataclasses import dataclass
+
+import numpy as np
+
+from console_game_engine import entity_factories
+from console_game_engine.entity import Entity
+from console_game_engine.game_map import GameMap
+from procedural_generator.room_generation import RoomSet
+
+
+@dataclass(frozen=True)
+class SpawnTable:
+    # Names are keys of entity_factories.prototypes
+    names: tuple[str, ...]
+    weights: tuple[float, ...]
+
+    def __post_init__(self) -> None:
+        if len(self.names) != len(self.weights) or len(self.names) == 0:
+            raise ValueError("A spawn table needs one weight per entity name.")
+        if min(self.weights) < 0 or sum(self.weights) <= 0:
+            raise ValueError("Spawn weights must be non-negative and not all zero.")
+
+    @property
+    def probabilities(self) -> np.ndarray:
+        weights = np.asarray(self.weights, dtype=np.float64)
+        return weights / weights.sum()
+
+
+monster_table = SpawnTable(names=("Orc", "Troll"), weights=(0.8, 0.2))
+
+
+@dataclass
+class SpawnPlan:
+    x: np.ndarray
+    y: np.ndarray
+    # Index of the room each spawn is in, and of its name in table.names
+    rooms: np.ndarray
+    kinds: np.ndarray
+    table: SpawnTable
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    @property
+    def names(self) -> list[str]:
+        return [self.table.names[kind] for kind in self.kinds.tolist()]
+
+    def materialize(self, game_map: GameMap, prototypes=None) -> list[Entity]:
+        """Spawns every planned entity into game_map and returns them in plan order."""
+        prototypes = prototypes or entity_factories.prototypes
+        kinds = [prototypes[name] for name in self.table.names]
+        return [
+            kinds[kind].spawn(game_map, x, y)
+            for x, y, kind in zip(self.x.tolist(), self.y.tolist(), self.kinds.tolist())
+        ]
+
+
+def occupied_cells(game_map: GameMap) -> np.ndarray:
+    """Boolean (width, height) mask of the cells holding an entity that blocks movement."""
+    return game_map.store.blocking_mask(game_map.width, game_map.height)
+
+
+def plan_spawns(
+    game_map: GameMap,
+    rooms: RoomSet,
+    max_per_room: int,
+    rng: np.random.Generator = None,
+    table: SpawnTable = monster_table,
+    occupied: np.ndarray = None,
+    skip_room_types: tuple[str, ...] = ("Spawn_Room",),
+) -> SpawnPlan:
+    """
+    Plans up to max_per_room spawns in each room, on the floor inside the room's walls and never on an occupied cell or on another planned spawn.  A room with fewer free cells than it drew gets one spawn per free cell.  occupied defaults to the cells of the blocking entities already on the map.
+    """
+    rng = np.random.default_rng(rng)
+    if occupied is None:
+        occupied = occupied_cells(game_map)
+
+    counts = rng.integers(0, max_per_room + 1, size=len(rooms))
+    counts[np.isin(rooms.room_types, skip_room_types)] = 0
+
+    # Every cell inside every room, clipped to the map, as one flat list
+    room_of_cell, xs, ys = rooms.cells(game_map.width, game_map.height, "inner")
+
+    free = game_map.tiles["walkable"][xs, ys] & ~occupied[xs, ys]
+    room_of_cell, xs, ys = room_of_cell[free], xs[free], ys[free]
+
+    # A random key per cell, sorted within each room, picks the first
+    # counts[room] cells of every room without replacement in one pass
+    order = np.lexsort((rng.random(len(xs)), room_of_cell))
+    room_of_cell, xs, ys = room_of_cell[order], xs[order], ys[order]
+    first_of_room = np.searchsorted(room_of_cell, room_of_cell)
+    chosen = np.arange(len(xs)) - first_of_room < counts[room_of_cell]
+    room_of_cell, xs, ys = room_of_cell[chosen], xs[chosen], ys[chosen]
+
+    # Rooms that share cells could pick the same one; keep the first pick
+    _, unique = np.unique(xs * game_map.height + ys, return_index=True)
+    unique.sort()
+    room_of_cell, xs, ys = room_of_cell[unique], xs[unique], ys[unique]
+
+    kinds = rng.choice(len(table.names), size=len(xs), p=table.probabilities)
+    return SpawnPlan(x=xs, y=ys, rooms=room_of_cell, kinds=kinds, table=table)
@@ -0,0 +1,159 @@
+# strategy_benchmark.py
+# Measures what each registered generation strategy costs across map sizes and
+# room counts, so a strategy can be chosen by its measured throughput, latency
+# and memory rather than by guesswork.
+import argparse
+import tracemalloc
+from dataclasses import dataclass, replace
+from typing import Iterable, Optional
+
+import numpy as np
+
+from procedural_generator.batch_generation import DungeonParameters, generate_one
+from procedural_generator.generation_strategies import STRATEGIES
+
+
+@dataclass
+class StrategyBenchmark:
+    strategy: str
+    width: int
+    height: int
+    max_rooms: int
+    # Seeds tried, and how many of them raised
+    dungeons: int
+    failures: int
+    # Throughput and latencies of the seeds that succeeded only, so a strategy
+    # whose failing seeds give up early is not made to look faster.  The
+    # latencies are in seconds, and NaN when every seed failed.
+    dungeons_per_second: float
+    p50: float
+    p95: float
+    # Peak memory traced by tracemalloc while generating one dungeon, in bytes
+    peak_memory: int
+
+
+def benchmark_strategy(
+    parameters: DungeonParameters, seeds: Iterable[int], memory_samples: int = 3
+) -> StrategyBenchmark:
+    """
+    Generates one dungeon per seed with the given parameters and reports the throughput and the latency percentiles of the seeds that succeeded, and how many failed.  tracemalloc slows generation down, so peak memory is measured in a separate pass over the first memory_samples seeds that succeeded.
+    """
+    seeds = list(seeds)
+    # Warm up first so lazy imports and caches are not billed to the first seed
+    generate_one(seeds[0], parameters)
+
+    results = [generate_one(seed, parameters) for seed in seeds]
+    succeeded = [result for result in results if result.error is None]
+    latencies = np.array([result.elapsed for result in succeeded])
+    if len(latencies):
+        dungeons_per_second = len(latencies) / latencies.sum()
+        p50, p95 = np.percentile(latencies, (50, 95)).tolist()
+    else:
+        dungeons_per_second, p50, p95 = 0.0, float("nan"), float("nan")
+
+    peak_memory = 0
+    for seed in [result.seed for result in succeeded][:memory_samples]:
+        tracemalloc.start()
+        try:
+            generate_one(seed, parameters)
+            peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+
+    return StrategyBenchmark(
+        strategy=parameters.strategy,
+        width=parameters.width,
+        height=parameters.height,
+        max_rooms=parameters.max_rooms,
+        dungeons=len(results),
+        failures=len(results) - len(succeeded),
+        dungeons_per_second=dungeons_per_second,
+        p50=p50,
+        p95=p95,
+        peak_memory=peak_memory,
+    )
+
+
+def benchmark_strategies(
+    strategies: Iterable[str],
+    sizes: Iterable[tuple[int, int]],
+    room_counts: Iterable[int],
+    seeds: Iterable[int],
+    base_parameters: DungeonParameters = DungeonParameters(),
+    memory_samples: int = 3,
+) -> list[StrategyBenchmark]:
+    seeds = list(seeds)
+    room_counts = list(room_counts)
+    sizes = list(sizes)
+    return [
+        benchmark_strategy(
+            replace(
+                base_parameters,
+                strategy=strategy,
+                width=width,
+                height=height,
+                max_rooms=max_rooms,
+            ),
+            seeds,
+            memory_samples,
+        )
+        for strategy in strategies
+        for width, height in sizes
+        for max_rooms in room_counts
+    ]
+
+
+def format_report(benchmarks: list[StrategyBenchmark]) -> str:
+    lines = [
+        f"{'strategy':<24}{'size':>10}{'rooms':>7}{'dungeons/s':>12}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'peak KiB':>10}{'failed':>8}"
+    ]
+    for b in benchmarks:
+        lines.append(
+            f"{b.strategy:<24}{f'{b.width}x{b.height}':>10}{b.max_rooms:>7}"
+            f"{b.dungeons_per_second:>12.1f}{b.p50 * 1000:>9.2f}{b.p95 * 1000:>9.2f}"
+            f"{b.peak_memory / 1024:>10.0f}{f'{b.failures}/{b.dungeons}':>8}"
+        )
+    return "\n".join(lines)
+
+
+def _size(text: str) -> tuple[int, int]:
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the registered dungeon generation strategies."
+    )
+    parser.add_argument(
+        "--strategies",
+        nargs="+",
+        choices=sorted(STRATEGIES),
+        default=sorted(STRATEGIES),
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=_size, default=[(80, 40), (160, 80), (320, 160)]
+    )
+    parser.add_argument("--room-counts", nargs="+", type=int, default=[10, 20, 40])
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--start-seed", type=int, default=0)
+    parser.add_argument("--memory-samples", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    seeds = range(args.start_seed, args.start_seed + args.count)
+    print(
+        format_report(
+            benchmark_strategies(
+                args.strategies,
+                args.sizes,
+                args.room_counts,
+                seeds,
+                memory_samples=args.memory_samples,
+            )
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+from unittest import mock
+
+from procedural_generator import batch_generation
+from procedural_generator.batch_generation import (
+    DungeonParameters,
+    generate_batch,
+    generate_one,
+    main,
+)
+
+parameters = DungeonParameters(strategy="bsp")
+
+
+def test_a_seed_that_raises_is_recorded_as_a_failure():
+    build_dungeon = batch_generation.build_dungeon
+
+    def fail_on_seed_3(seed, parameters):
+        if seed == 3:
+            raise IndexError("index 80 is out of bounds")
+        return build_dungeon(seed, parameters)
+
+    with mock.patch.object(batch_generation, "build_dungeon", fail_on_seed_3):
+        results = {
+            result.seed: result for result in generate_batch(range(5), parameters, 1)
+        }
+
+    assert sorted(results) == [0, 1, 2, 3, 4]
+    assert results[3].tiles is None
+    assert results[3].error == "IndexError: index 80 is out of bounds"
+    assert all(results[seed].error is None for seed in (0, 1, 2, 4))
+
+
+def test_generate_one_encodes_the_tiles():
+    result = generate_one(0, parameters)
+    assert result.error is None
+    assert result.tiles.shape == (parameters.width, parameters.height)
+
+
+def test_process_pool_returns_every_seed_in_order():
+    seeds = list(range(7))
+    pooled = list(generate_batch(seeds, parameters, workers=2, chunk_size=2))
+    inline = list(generate_batch(seeds, parameters, workers=1))
+    assert [result.seed for result in pooled] == seeds
+    for pooled_result, inline_result in zip(pooled, inline):
+        assert pooled_result.error == inline_result.error
+        assert (pooled_result.tiles == inline_result.tiles).all()
+
+
+def test_main_counts_only_the_dungeons_that_were_generated(capsys):
+    build_dungeon = batch_generation.build_dungeon
+
+    def fail_on_seed_0(seed, parameters):
+        if seed == 0:
+            raise ValueError("No points of interest found")
+        return build_dungeon(seed, parameters)
+
+    with mock.patch.object(batch_generation, "build_dungeon", fail_on_seed_0):
+        main(["--count", "3", "--workers", "1", "--strategy", "bsp"])
+    output = capsys.readouterr().out
+    assert "Seed 0 failed: ValueError: No points of interest found" in output
+    assert "Generated 2 dungeons" in output
+    assert "1 failed" in output
@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+
+from console_game_engine import entity_factories
+from console_game_engine.game_map import GameMap
+from procedural_generator.cellular_automata import (
+    cave_rooms,
+    cave_walls,
+    fill_small_regions,
+    wall_counts,
+)
+from procedural_generator.procedural_gen import generate_dungeon
+
+
+class TestCellularAutomata(unittest.TestCase):
+    def test_wall_counts_match_a_loop_over_every_cell(self):
+        walls = np.random.default_rng(4).random((9, 7)) < 0.5
+        padded = np.pad(walls, 1, constant_values=True)
+        expected = np.array(
+            [[padded[x : x + 3, y : y + 3].sum() for y in range(7)] for x in range(9)]
+        )
+        self.assertTrue((wall_counts(walls) == expected).all())
+
+    def test_caves_are_walled_in_and_seeded(self):
+        walls = cave_walls(40, 30, rng=2)
+        self.assertEqual(walls.shape, (40, 30))
+        self.assertTrue(walls[[0, -1], :].all() and walls[:, [0, -1]].all())
+        self.assertFalse(walls.all())
+        self.assertTrue((walls == cave_walls(40, 30, rng=2)).all())
+
+    def test_small_regions_are_filled_unless_kept(self):
+        floor = np.zeros((10, 10), dtype=bool)
+        floor[1:5, 1:5] = True
+        floor[7, 7] = True
+        floor[8, 1] = True
+        kept = fill_small_regions(floor, min_area=4, keep=(7, 7))
+        self.assertTrue(kept[1:5, 1:5].all())
+        self.assertTrue(kept[7, 7])
+        self.assertFalse(kept[8, 1])
+
+    def test_cave_rooms_bound_the_floor_of_each_block(self):
+        floor = np.zeros((20, 10), dtype=bool)
+        floor[2:6, 3:5] = True
+        floor[12:19, 1:9] = True
+        rooms = cave_rooms(floor, block_size=10, max_rooms=5)
+        self.assertEqual(len(rooms), 2)
+        # Most floor first, and the inside of each room is the floor's bounding box
+        self.assertEqual((rooms[0].x1 + 1, rooms[0].x2), (12, 19))
+        self.assertEqual((rooms[1].x1 + 1, rooms[1].y1 + 1), (2, 3))
+        self.assertEqual((rooms[1].x2, rooms[1].y2), (6, 5))
+        self.assertEqual(len(cave_rooms(floor, block_size=10, max_rooms=1)), 1)
+
+    def test_cave_dungeons_are_connected_and_populated(self):
+        for seed in range(5):
+            game_map = GameMap(80, 40)
+            player = entity_factories.player.spawn(game_map, 40, 20)
+            layout = generate_dungeon(
+                game_map,
+                20,
+                5,
+                10,
+                player,
+                strategy="cellular_automata",
+                rng=seed,
+            )
+            self.assertEqual(layout.rooms[0].room_type, "Spawn_Room")
+            self.assertTrue(game_map.tiles["walkable"][40, 20])
+            self.assertEqual(layout.reachability.component_count, 1)
+            self.assertTrue(layout.reachability.is_connected)
+            self.assertGreater(len(layout.monsters), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
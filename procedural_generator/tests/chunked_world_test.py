@@ -0,0 +1,81 @@
+import unittest
+
+from scipy import ndimage
+
+from console_game_engine.game_map import GameMap
+from procedural_generator.chunked_world import FLOOR, ChunkedWorld
+
+
+class TestChunkedWorld(unittest.TestCase):
+    def test_chunks_are_only_generated_on_demand(self):
+        world = ChunkedWorld(seed=3)
+        self.assertEqual(len(world), 0)
+        generated = world.ensure_loaded_around(5, 5, 10)
+        self.assertEqual(sorted(generated), [(-1, -1), (-1, 0), (0, -1), (0, 0)])
+        self.assertEqual(world.ensure_loaded_around(5, 5, 10), [])
+        self.assertEqual(len(world), 4)
+
+    def test_chunks_do_not_depend_on_load_order(self):
+        forwards = ChunkedWorld(seed=12)
+        backwards = ChunkedWorld(seed=12)
+        coordinates = [(cx, cy) for cx in range(-2, 3) for cy in range(-2, 3)]
+        for cx, cy in coordinates:
+            forwards.chunk(cx, cy)
+        for cx, cy in reversed(coordinates):
+            backwards.chunk(cx, cy)
+        for cx, cy in coordinates:
+            self.assertTrue(
+                (forwards.chunk(cx, cy).tiles == backwards.chunk(cx, cy).tiles).all()
+            )
+
+    def test_different_seeds_give_different_worlds(self):
+        first = ChunkedWorld(seed=1).window(0, 0, 64, 64)
+        second = ChunkedWorld(seed=2).window(0, 0, 64, 64)
+        self.assertFalse((first == second).all())
+
+    def test_tunnels_meet_at_every_seam(self):
+        world = ChunkedWorld(seed=5)
+        size = world.chunk_size
+        for cx in range(-2, 2):
+            for cy in range(-2, 2):
+                east_x, east_y = world.chunk(cx, cy).doors[0]
+                west_x, west_y = world.chunk(cx + 1, cy).doors[2]
+                self.assertEqual(east_y, west_y)
+                self.assertTrue(
+                    world.is_walkable(cx * size + east_x, cy * size + east_y)
+                )
+                self.assertTrue(
+                    world.is_walkable((cx + 1) * size + west_x, cy * size + west_y)
+                )
+
+                south_x, south_y = world.chunk(cx, cy).doors[1]
+                north_x, north_y = world.chunk(cx, cy + 1).doors[3]
+                self.assertEqual(south_x, north_x)
+
+    def test_loaded_area_is_connected(self):
+        world = ChunkedWorld(seed=9)
+        size = world.chunk_size
+        window = world.window(-2 * size, -2 * size, 4 * size, 4 * size)
+        _, num_regions = ndimage.label(window == FLOOR)
+        self.assertEqual(num_regions, 1)
+
+    def test_views_round_trip_explored_tiles(self):
+        world = ChunkedWorld(seed=4)
+        game_map = GameMap(40, 20)
+        world.load_view(game_map, 20, -10)
+        self.assertTrue(
+            (
+                game_map.tiles["walkable"] == (world.window(20, -10, 40, 20) == FLOOR)
+            ).all()
+        )
+        self.assertFalse(game_map.explored.any())
+
+        game_map.explored[5:15, 3:8] = True
+        world.store_view(game_map, 20, -10)
+        explored = world.explored_window(0, -20, 80, 40)
+        self.assertEqual(explored.sum(), 50)
+        self.assertTrue(explored[25:35, 13:18].all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from procedural_generator.triangulator import (
     Triangulator,
     DelaunayTriangulationAlgorithm as Delaunay,
@@ -37,6 +39,28 @@ class TestDelaunayTriangulation(unittest.TestCase):
         for edge in dt.triangulation:
             self.assertTrue(edge[0] < num_points and edge[1] < num_points)
 
+    def test_edges_are_an_array_of_unique_undirected_pairs(self):
+        rng = np.random.default_rng(8)
+        points = list({tuple(p) for p in rng.integers(0, 200, (300, 2)).tolist()})
+        dt = Triangulator(points, Delaunay())
+        self.assertEqual(dt.edges.ndim, 2)
+        self.assertEqual(dt.edges.shape[1], 2)
+        canonical = np.sort(dt.edges, axis=1)
+        self.assertEqual(len(np.unique(canonical, axis=0)), len(dt.edges))
+        self.assertEqual(dt.triangulation, list(map(tuple, dt.edges.tolist())))
+
+    def test_sorted_edges_are_ordered_by_their_points(self):
+        rng = np.random.default_rng(9)
+        points = list({tuple(p) for p in rng.integers(0, 50, (80, 2)).tolist()})
+        dt = Triangulator(points, Delaunay())
+
+        def key_function(edge):
+            return tuple(sorted([points[edge[0]], points[edge[1]]]))
+
+        keys = [key_function(edge) for edge in dt.sorted_edges]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(set(dt.sorted_edges), set(dt.triangulation))
+
     def test_raises_value_error_with_fewer_than_three_points(self):
         points = [(0, 0), (1, 0)]
         with self.assertRaises(ValueError):
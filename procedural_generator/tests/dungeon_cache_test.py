@@ -0,0 +1,92 @@
+import dataclasses
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from console_game_engine import entity_factories, tile_types
+from console_game_engine.game_map import GameMap
+from procedural_generator.dungeon_cache import CachedDungeon, DungeonCache, DungeonKey
+from procedural_generator.room_generation import RectangularRoom, RoomSet
+
+
+def make_key(seed=0):
+    return DungeonKey(
+        seed=seed,
+        width=20,
+        height=10,
+        max_rooms=5,
+        room_min_size=3,
+        room_max_size=6,
+        max_monsters_per_room=2,
+        strategy="longest_path_in_mst",
+        player_x=5,
+        player_y=5,
+    )
+
+
+def make_dungeon():
+    game_map = GameMap(20, 10)
+    room = RectangularRoom(2, 2, 5, 4, "Basic_Room")
+    game_map.add_room_to_game_map(room, tile_type="floor", slice_type="inner")
+    orc = entity_factories.orc.spawn(game_map, 4, 4)
+    return CachedDungeon.from_generation(game_map, RoomSet.from_rooms([room]), [orc])
+
+
+class TestDungeonCache(unittest.TestCase):
+    def test_memory_hit_returns_the_same_dungeon(self):
+        cache = DungeonCache()
+        dungeon = make_dungeon()
+        cache.put(make_key(), dungeon)
+        self.assertIs(cache.get(make_key()), dungeon)
+        self.assertIsNone(cache.get(make_key(seed=1)))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        dungeon = make_dungeon()
+        cache = DungeonCache(max_memory_bytes=2 * dungeon.nbytes)
+        cache.put(make_key(0), make_dungeon())
+        cache.put(make_key(1), make_dungeon())
+        cache.get(make_key(0))
+        cache.put(make_key(2), make_dungeon())
+        self.assertEqual(len(cache), 2)
+        self.assertLessEqual(cache.memory_bytes, 2 * dungeon.nbytes)
+        self.assertIsNotNone(cache.get(make_key(0)))
+        self.assertIsNone(cache.get(make_key(1)))
+
+    def test_disk_tier_is_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            dungeon = make_dungeon()
+            DungeonCache(directory=directory).put(make_key(), dungeon)
+            self.assertEqual(len(os.listdir(directory)), 3)
+
+            loaded = DungeonCache(directory=directory).get(make_key())
+            self.assertIsInstance(loaded.tiles, np.memmap)
+            np.testing.assert_array_equal(loaded.tiles, dungeon.tiles)
+            np.testing.assert_array_equal(loaded.rooms, dungeon.rooms)
+            np.testing.assert_array_equal(loaded.spawns, dungeon.spawns)
+
+    def test_apply_to_restores_tiles_rooms_and_spawns(self):
+        dungeon = make_dungeon()
+        game_map = GameMap(20, 10)
+        entities = dungeon.apply_to(game_map)
+        self.assertEqual(
+            tile_types.encode_tiles(game_map.tiles).tolist(), dungeon.tiles.tolist()
+        )
+        self.assertEqual(
+            [(e.name, e.transform.x, e.transform.y) for e in entities], [("Orc", 4, 4)]
+        )
+        self.assertEqual(len(game_map.entities), 1)
+        self.assertEqual(
+            str(dungeon.room_set()[0]), str(RectangularRoom(2, 2, 5, 4, "Basic_Room"))
+        )
+
+    def test_entries_from_another_generator_version_are_not_served(self):
+        with tempfile.TemporaryDirectory() as directory:
+            old_key = dataclasses.replace(
+                make_key(), generator_version=make_key().generator_version - 1
+            )
+            self.assertNotEqual(old_key.digest, make_key().digest)
+            DungeonCache(directory=directory).put(old_key, make_dungeon())
+            self.assertIsNone(DungeonCache(directory=directory).get(make_key()))
@@ -73,6 +73,68 @@ class TestNonOverlappingRandomPointsGenerator(unittest.TestCase):
             NonOverlappingRandomPointsGenerator(10, 5, -100)
 
 
+class TestPoissonDiskSampling(unittest.TestCase):
+    def test_output_length(self):
+        points = NonOverlappingRandomPointsGenerator(
+            10, 5, 100, sampling="poisson"
+        ).generated_points
+        self.assertEqual(len(points), 10)
+
+    def test_minimum_distance(self):
+        points = NonOverlappingRandomPointsGenerator(
+            200, 5, 100, sampling="poisson"
+        ).generated_points
+        for i in range(len(points)):
+            for j in range(i + 1, len(points)):
+                self.assertGreaterEqual(
+                    np.sqrt(
+                        (points[i][0] - points[j][0]) ** 2
+                        + (points[i][1] - points[j][1]) ** 2
+                    ),
+                    5,
+                )
+
+    def test_points_within_max_coordinate(self):
+        points = NonOverlappingRandomPointsGenerator(
+            200, 5, 100, sampling="poisson"
+        ).generated_points
+        for point in points:
+            self.assertGreater(point[0], 5)
+            self.assertLess(point[0], 95)
+            self.assertGreater(point[1], 5)
+            self.assertLess(point[1], 95)
+
+    def test_points_are_integer_tuples(self):
+        points = NonOverlappingRandomPointsGenerator(
+            10, 5, 100, sampling="poisson"
+        ).generated_points
+        for point in points:
+            self.assertIsInstance(point, tuple)
+            self.assertIsInstance(point[0], int)
+            self.assertIsInstance(point[1], int)
+
+    def test_stops_when_space_is_full(self):
+        points = NonOverlappingRandomPointsGenerator(
+            10000, 5, 100, sampling="poisson"
+        ).generated_points
+        self.assertLess(len(points), 10000)
+        self.assertGreater(len(points), 0)
+
+    def test_same_seed_gives_same_points(self):
+        for sampling in ("rejection", "poisson"):
+            points_a = NonOverlappingRandomPointsGenerator(
+                50, 5, 100, sampling=sampling, rng=7
+            ).generated_points
+            points_b = NonOverlappingRandomPointsGenerator(
+                50, 5, 100, sampling=sampling, rng=7
+            ).generated_points
+            self.assertEqual(points_a, points_b)
+
+    def test_unknown_sampling_mode_will_raise_value_error(self):
+        with self.assertRaises(ValueError):
+            NonOverlappingRandomPointsGenerator(10, 5, 100, sampling="grid")
+
+
 class TestOtherPointsAreMinimumDistanceAway(unittest.TestCase):
     def test_other_points_are_minumum_distance_away_false(self):
         assert other_points_are_min_dist_away(2, [(0, 0), (2, 2)], (1, 1)) == False
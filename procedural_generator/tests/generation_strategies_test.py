@@ -1,3 +1,21 @@
+from unittest import mock
+
+import pytest
+
+from console_game_engine import entity_factories, tile_types
+from console_game_engine.game_map import GameMap
+from procedural_generator import strategy_benchmark
+from procedural_generator.batch_generation import BatchResult, DungeonParameters
+from procedural_generator.generation_strategies import (
+    STRATEGIES,
+    get_strategy,
+    longest_path_in_mst_strategy,
+    register_strategy,
+    strategy_name,
+)
+from procedural_generator.map_validation import check_reachability
+from procedural_generator.strategy_benchmark import benchmark_strategy
+
 # import pytest
 # from console_game_engine.game_map import GameMap
 # from procedural_generator.generation_strategies import basic_generation_strategy
@@ -42,3 +60,115 @@
 #             assert x < game_map.width - 1
 #             assert y >= 1
 #             assert y < game_map.height - 1
+
+
+def test_registered_strategies():
+    assert {"longest_path_in_mst", "basic"} <= set(STRATEGIES)
+    assert get_strategy("longest_path_in_mst") is longest_path_in_mst_strategy
+    assert get_strategy(longest_path_in_mst_strategy) is longest_path_in_mst_strategy
+    assert strategy_name(longest_path_in_mst_strategy) == "longest_path_in_mst"
+    assert strategy_name("basic") == "basic"
+
+
+def test_unknown_strategy_raises():
+    with pytest.raises(ValueError):
+        get_strategy("no_such_strategy")
+
+
+def test_names_cannot_be_registered_twice():
+    with pytest.raises(ValueError):
+        register_strategy("basic")(lambda **kwargs: ([], []))
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+def test_every_strategy_carves_around_the_player(name):
+    game_map = GameMap(80, 40)
+    player = entity_factories.player.spawn(game_map, 40, 20)
+    rooms, tunnels = get_strategy(name)(
+        game_map=game_map,
+        max_rooms=15,
+        player_transform=player.transform,
+        room_min_size=5,
+        room_max_size=10,
+        rng=3,
+    )
+    assert rooms[0].room_type == "Spawn_Room"
+    assert game_map.tiles[40, 20] == tile_types.floor
+    assert (game_map.tiles == tile_types.floor).sum() > 36
+
+
+def test_bsp_places_one_room_per_leaf_without_overlaps():
+    game_map = GameMap(80, 40)
+    player = entity_factories.player.spawn(game_map, 10, 10)
+    rooms, tunnels = get_strategy("bsp")(
+        game_map=game_map,
+        max_rooms=15,
+        player_transform=player.transform,
+        room_min_size=5,
+        room_max_size=10,
+        rng=8,
+    )
+    # The spawn room plus max_rooms, every time, as long as the map has room
+    assert len(rooms) == 16
+    assert len(tunnels) == 2 * (len(rooms) - 1)
+    # Rooms in neighbouring leaves can share a wall, but never floor
+    coverage = sum(
+        rooms[i : i + 1].mask(80, 40, "inner").astype(int) for i in range(len(rooms))
+    )
+    assert coverage.max() == 1
+    assert check_reachability(game_map, rooms, (10, 10)).is_connected
+
+
+def test_bsp_stops_splitting_when_the_map_is_full():
+    game_map = GameMap(30, 20)
+    player = entity_factories.player.spawn(game_map, 15, 10)
+    rooms, _ = get_strategy("bsp")(
+        game_map=game_map,
+        max_rooms=100,
+        player_transform=player.transform,
+        room_min_size=5,
+        room_max_size=10,
+        rng=1,
+    )
+    assert 1 < len(rooms) <= (30 // 5) * (20 // 5)
+    assert check_reachability(game_map, rooms, (15, 10)).is_connected
+
+
+def test_bsp_is_deterministic_for_a_seed():
+    maps = []
+    for _ in range(2):
+        game_map = GameMap(80, 40)
+        player = entity_factories.player.spawn(game_map, 40, 20)
+        get_strategy("bsp")(
+            game_map=game_map,
+            max_rooms=20,
+            player_transform=player.transform,
+            rng=11,
+        )
+        maps.append(game_map.tiles["walkable"])
+    assert (maps[0] == maps[1]).all()
+
+
+def test_benchmark_strategy_reports_throughput_and_latency():
+    benchmark = benchmark_strategy(
+        DungeonParameters(strategy="basic"), range(4), memory_samples=1
+    )
+    assert benchmark.dungeons == 4
+    assert benchmark.dungeons_per_second > 0
+    assert 0 < benchmark.p50 <= benchmark.p95
+    assert benchmark.peak_memory > 0
+
+
+def test_benchmark_strategy_times_only_the_seeds_that_succeeded():
+    # Odd seeds fail straight away; they must not pull the latencies down
+    def generate_one(seed, parameters):
+        if seed % 2:
+            return BatchResult(seed, None, 0.001, error="ValueError: failed")
+        return BatchResult(seed, None, 0.1)
+
+    with mock.patch.object(strategy_benchmark, "generate_one", generate_one):
+        benchmark = benchmark_strategy(DungeonParameters(), range(6), memory_samples=0)
+    assert (benchmark.dungeons, benchmark.failures) == (6, 3)
+    assert benchmark.p50 == pytest.approx(0.1)
+    assert benchmark.p95 == pytest.approx(0.1)
+    assert benchmark.dungeons_per_second == pytest.approx(10)
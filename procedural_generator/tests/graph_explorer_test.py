@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+
+from procedural_generator.graph_explorer import GraphExplorer
+from procedural_generator.minimum_spanning_tree_finder import MinimumSpanningTreeFinder
+
+
+class TestGraphExplorer(unittest.TestCase):
+    def test_longest_path_of_a_line_with_a_branch(self):
+        points = [(0, 0), (1, 0), (3, 0), (6, 0), (3, 1)]
+        graph = [(0, 1), (1, 2), (2, 3), (2, 4)]
+        explorer = GraphExplorer(graph, points)
+        self.assertEqual(explorer.points_of_longest_path, [0, 1, 2, 3])
+        self.assertAlmostEqual(explorer.longest_path_length, 6.0)
+        self.assertEqual(explorer.points_of_interest, [2])
+
+    def test_longest_path_of_a_star(self):
+        points = [(5, 5), (5, 2), (0, 5), (5, 15), (6, 5)]
+        graph = [(0, 1), (0, 2), (0, 3), (0, 4)]
+        explorer = GraphExplorer(graph, points)
+        self.assertEqual(explorer.points_of_longest_path, [0, 2, 3])
+        self.assertAlmostEqual(explorer.longest_path_length, 15.0)
+        self.assertEqual(explorer.points_of_interest, [0])
+
+    def test_longest_path_is_a_chain_of_edges(self):
+        points = [(0, 0), (4, 0), (4, 3), (9, 3), (4, 9)]
+        graph = [(0, 1), (1, 2), (2, 3), (2, 4)]
+        explorer = GraphExplorer(graph, points)
+        path = explorer.longest_path
+        for (_, v), (u, _) in zip(path, path[1:]):
+            self.assertEqual(v, u)
+        self.assertEqual({path[0][0], path[-1][1]}, {0, 4})
+        self.assertAlmostEqual(explorer.longest_path_length, 13.0)
+
+    def test_longest_path_matches_brute_force_on_random_trees(self):
+        for _ in range(20):
+            points = list(
+                {
+                    (np.random.randint(0, 100), np.random.randint(0, 100))
+                    for _ in range(30)
+                }
+            )
+            mst = MinimumSpanningTreeFinder(points).minimum_spanning_tree
+            explorer = GraphExplorer(mst, points)
+
+            longest = 0
+            for start in range(len(points)):
+                longest = max(longest, max(_tree_distances(mst, points, start)))
+            self.assertAlmostEqual(explorer.longest_path_length, longest)
+
+    def test_adjacency_index_degrees_and_neighbors(self):
+        points = [(5, 5), (5, 2), (0, 5), (5, 15), (6, 5)]
+        graph = [(0, 1), (0, 2), (0, 3), (0, 4)]
+        adjacency = GraphExplorer(graph, points).adjacency
+        self.assertEqual(adjacency.degree.tolist(), [4, 1, 1, 1, 1])
+        self.assertEqual(sorted(adjacency.neighbors_of(0).tolist()), [1, 2, 3, 4])
+        self.assertEqual(adjacency.neighbors_of(3).tolist(), [0])
+
+    def test_branch_depths_and_sizes(self):
+        # Path 0-1-2-3 with a two node branch off 1 and a single node off 2
+        points = [(0, 0), (10, 0), (20, 0), (30, 0), (10, 3), (10, 6), (20, 2)]
+        graph = [(0, 1), (1, 2), (2, 3), (1, 4), (4, 5), (2, 6)]
+        explorer = GraphExplorer(graph, points)
+        self.assertEqual(explorer.points_of_interest, [1, 2])
+        self.assertEqual(explorer.branch_depths, {1: 2, 2: 1})
+        self.assertEqual(explorer.branch_sizes, {1: 2, 2: 1})
+
+    def test_raises_value_error_without_edges(self):
+        with self.assertRaises(ValueError):
+            GraphExplorer([], [(0, 0)])
+
+
+def _tree_distances(edges, points, start):
+    distances = [None] * len(points)
+    distances[start] = 0.0
+    frontier = [start]
+    while frontier:
+        node = frontier.pop()
+        for u, v in edges:
+            for a, b in ((u, v), (v, u)):
+                if a == node and distances[b] is None:
+                    distances[b] = distances[a] + np.hypot(
+                        points[a][0] - points[b][0], points[a][1] - points[b][1]
+                    )
+                    frontier.append(b)
+    return [d for d in distances if d is not None]
@@ -0,0 +1,110 @@
+import json
+import os
+import subprocess
+import sys
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from console_game_engine import tile_types
+from procedural_generator.batch_generation import DungeonParameters, generate_one
+from procedural_generator import headless
+from procedural_generator.headless import export, generate, main
+
+parameters = DungeonParameters(strategy="bsp")
+
+
+def test_generates_the_same_dungeon_as_the_batch_job():
+    dungeon = generate(4, parameters)
+    assert (
+        tile_types.encode_tiles(dungeon.game_map.tiles)
+        == generate_one(4, parameters).tiles
+    ).all()
+    assert list(dungeon.timings)[:3] == ["strategy", "monsters", "connectivity"]
+    assert all(seconds >= 0 for seconds in dungeon.timings.values())
+
+
+def test_does_not_load_the_engine_or_a_tileset():
+    # In a fresh interpreter, since other tests may have imported the engine
+    script = (
+        "import sys\n"
+        "from procedural_generator.headless import generate\n"
+        "generate(1)\n"
+        "print('configurations' in sys.modules, 'console_game_engine.engine' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.split() == ["False", "False"]
+
+
+def test_runs_from_outside_the_repository(tmp_path):
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    result = subprocess.run(
+        [sys.executable, "-m", "procedural_generator.headless", "--seed", "1"],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": root},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "Seed 1:" in result.stdout
+    # The log files still go to the repository, not the current directory
+    assert not (tmp_path / "logs").exists()
+
+
+def test_npz_export_round_trips(tmp_path):
+    dungeon = generate(2, parameters)
+    export(dungeon, str(tmp_path / "dungeon.npz"))
+    with np.load(tmp_path / "dungeon.npz") as saved:
+        decoded = tile_types.decode_tiles(saved["tiles"])
+        assert (decoded == dungeon.game_map.tiles).all()
+        assert len(saved["rooms"]) == len(dungeon.layout.rooms)
+        assert saved["entities"][0]["name"] == "Player"
+        assert len(saved["entities"]) == len(dungeon.game_map.entities)
+        assert json.loads(str(saved["metadata"]))["seed"] == 2
+
+
+def test_json_export_has_rows_of_tiles(tmp_path):
+    dungeon = generate(2, parameters)
+    export(dungeon, str(tmp_path / "out" / "dungeon.json"))
+    with open(tmp_path / "out" / "dungeon.json") as f:
+        document = json.load(f)
+    assert len(document["tiles"]) == parameters.height
+    assert len(document["tiles"][0]) == parameters.width
+    player = document["entities"][0]
+    assert player["name"] == "Player"
+    assert document["tile_names"][document["tiles"][player["y"]][player["x"]]] == (
+        "floor"
+    )
+    assert document["rooms"][0]["room_type"] == "Spawn_Room"
+
+
+def test_unknown_export_formats_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        export(generate(2, parameters), str(tmp_path / "dungeon.txt"))
+    with pytest.raises(SystemExit):
+        main(["--output", str(tmp_path / "dungeon.txt")])
+
+
+def test_main_prints_the_stage_timings(tmp_path, capsys):
+    assert main(["--seed", "3", "--output", str(tmp_path / "dungeon.npz")]) == 0
+    output = capsys.readouterr().out
+    for stage in ("strategy", "monsters", "connectivity", "export .npz", "total"):
+        assert stage in output
+
+
+def test_main_reports_any_generation_error_on_one_line(capsys):
+    def fail(seed, parameters):
+        raise IndexError("index 80 is out of bounds")
+
+    with mock.patch.object(headless, "build_dungeon", fail):
+        assert main(["--seed", "5"]) == 1
+    assert capsys.readouterr().out == (
+        "Seed 5 failed: IndexError: index 80 is out of bounds\n"
+    )
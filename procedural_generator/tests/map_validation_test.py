@@ -0,0 +1,111 @@
+import numpy as np
+import pytest
+
+from console_game_engine import entity_factories
+from console_game_engine.game_map import GameMap
+from procedural_generator.generation_strategies import carve_rooms_and_tunnels
+from procedural_generator.map_validation import (
+    check_reachability,
+    validate_connectivity,
+)
+from procedural_generator.procedural_gen import generate_dungeon
+from procedural_generator.room_generation import RectangularRoom, RoomSet
+
+
+@pytest.fixture
+def islands():
+    # Two rooms joined by a tunnel, and a third room on its own with an orc in it
+    game_map = GameMap(40, 20)
+    rooms = RoomSet.from_rooms(
+        [
+            RectangularRoom(2, 2, 6, 6, "Spawn_Room"),
+            RectangularRoom(14, 2, 6, 6, "Basic_Room"),
+            RectangularRoom(28, 10, 6, 6, "Basic_Room"),
+        ]
+    )
+    tunnels = RoomSet.from_rooms([RectangularRoom(5, 5, 12, 1, "Horzontal Tunnel")])
+    carve_rooms_and_tunnels(game_map, rooms, tunnels)
+    player = entity_factories.player.spawn(game_map, 5, 5)
+    orc = entity_factories.orc.spawn(game_map, 30, 12)
+    return game_map, rooms, player, orc
+
+
+def test_reports_unreachable_rooms_and_entities(islands):
+    game_map, rooms, player, orc = islands
+    report = check_reachability(game_map, rooms, (5, 5))
+    assert report.component_count == 2
+    assert report.unreachable_rooms == [2]
+    assert report.unreachable_entities == [orc]
+    assert not report.is_connected
+    assert report.reachable[17, 5] and not report.reachable[30, 12]
+
+
+def test_diagonal_neighbours_are_not_connected():
+    game_map = GameMap(10, 10)
+    game_map.carve_rectangles([1, 2], [1, 2], [2, 3], [2, 3])
+    report = check_reachability(game_map, RoomSet.empty(), (1, 1))
+    assert report.component_count == 2
+
+
+def test_start_on_a_wall_reaches_nothing(islands):
+    game_map, rooms, _, _ = islands
+    report = check_reachability(game_map, rooms, (0, 0))
+    assert report.start_label == 0
+    assert report.unreachable_rooms == [0, 1, 2]
+    # Nothing to repair towards, so the map is left alone
+    tiles = game_map.tiles.copy()
+    validate_connectivity(game_map, rooms, (0, 0), repair="reconnect")
+    assert (game_map.tiles == tiles).all()
+
+
+def test_report_mode_does_not_change_the_map(islands):
+    game_map, rooms, _, _ = islands
+    tiles = game_map.tiles.copy()
+    report, kept_rooms, tunnels = validate_connectivity(game_map, rooms, (5, 5))
+    assert report.unreachable_rooms == [2]
+    assert kept_rooms is rooms and len(tunnels) == 0
+    assert (game_map.tiles == tiles).all()
+
+
+def test_prune_walls_in_islands_and_removes_their_entities(islands):
+    game_map, rooms, player, orc = islands
+    report, kept_rooms, _ = validate_connectivity(
+        game_map, rooms, (5, 5), repair="prune"
+    )
+    assert report.is_connected
+    assert [str(room) for room in kept_rooms] == [str(room) for room in rooms[:2]]
+    assert not game_map.tiles["walkable"][29:34, 11:16].any()
+    assert game_map.entities == {player}
+
+
+def test_reconnect_tunnels_to_the_nearest_reachable_floor(islands):
+    game_map, rooms, player, orc = islands
+    report, kept_rooms, tunnels = validate_connectivity(
+        game_map, rooms, (5, 5), repair="reconnect"
+    )
+    assert report.is_connected and report.component_count == 1
+    assert kept_rooms is rooms
+    assert len(tunnels) == 2
+    assert game_map.entities == {player, orc}
+
+
+def test_validate_connectivity_rejects_unknown_modes(islands):
+    game_map, rooms, _, _ = islands
+    with pytest.raises(ValueError):
+        validate_connectivity(game_map, rooms, (5, 5), repair="ignore")
+
+
+@pytest.mark.parametrize("connectivity", ["prune", "reconnect"])
+def test_repaired_dungeons_are_connected(connectivity):
+    for seed in range(10):
+        rng = np.random.default_rng(seed)
+        game_map = GameMap(80, 40)
+        player = entity_factories.player.spawn(game_map, 40, 20)
+        try:
+            layout = generate_dungeon(
+                game_map, 20, 5, 10, player, rng=rng, connectivity=connectivity
+            )
+        except ValueError:
+            continue
+        assert layout.reachability.is_connected
+        assert set(layout.monsters) <= game_map.entities
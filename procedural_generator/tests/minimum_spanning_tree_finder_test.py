@@ -34,6 +34,30 @@ class TestMinimumSpanningTreeFinder(unittest.TestCase):
         expected_weights = np.array(expected_weights)
         np.testing.assert_array_equal(computed_weights, expected_weights)
 
+    def test_compute_weights_is_cached(self):
+        points = [(0, 0), (1, 0), (0, 1), (1, 1)]
+        mst = MinimumSpanningTreeFinder(points)
+        self.assertIs(mst.compute_weights, mst.compute_weights)
+
+    def test_condensed_weights(self):
+        SQRT_2 = np.sqrt(2)
+        points = [(0, 0), (1, 0), (0, 1), (1, 1)]
+        mst = MinimumSpanningTreeFinder(points)
+        expected_weights = np.array([1.0, 1.0, SQRT_2, SQRT_2, 1.0, 1.0])
+        np.testing.assert_array_equal(mst.condensed_weights, expected_weights)
+        self.assertEqual(mst.weight(3, 0), SQRT_2)
+        self.assertEqual(mst.weight(2, 3), 1.0)
+        self.assertEqual(mst.weight(1, 1), 0.0)
+
+    def test_compute_weights_as_float32(self):
+        points = [(0, 0), (1, 0), (0, 1), (1, 1)]
+        mst = MinimumSpanningTreeFinder(points, dtype=np.float32)
+        self.assertEqual(mst.condensed_weights.dtype, np.float32)
+        self.assertEqual(mst.compute_weights.dtype, np.float32)
+        edges = mst.minimum_spanning_tree
+        self.assertEqual(len(edges), 3)
+        self.assertEqual(sum(mst.weight(u, v) for u, v in edges), 3.0)
+
     def test_compute_minimum_spanning_tree(self):
         points = [(0, 0), (1, 0), (0, 1), (1, 1)]
         mst = MinimumSpanningTreeFinder(points)
@@ -51,3 +75,41 @@ class TestMinimumSpanningTreeFinder(unittest.TestCase):
             mst = MinimumSpanningTreeFinder(points)
 
             self.assertEqual(len(mst.minimum_spanning_tree), len(points) - 1)
+
+    def test_raise_value_error_with_unknown_algorithm(self):
+        points = [(0, 0), (1, 0), (0, 1)]
+        with self.assertRaises(ValueError):
+            MinimumSpanningTreeFinder(points, algorithm="boruvka")
+
+    def test_compute_minimum_spanning_tree_with_delaunay_kruskal(self):
+        points = [(0, 0), (1, 0), (0, 1), (3, 3)]
+        mst = MinimumSpanningTreeFinder(points, algorithm="delaunay_kruskal")
+        expected_edges = [(0, 1), (0, 2), (1, 3)]
+        self.assertEqual(set(mst.minimum_spanning_tree), set(expected_edges))
+
+    def test_delaunay_kruskal_falls_back_for_collinear_points(self):
+        points = [(0, 0), (1, 1), (2, 2), (3, 3)]
+        mst = MinimumSpanningTreeFinder(points, algorithm="delaunay_kruskal")
+        self.assertEqual(
+            set(mst.minimum_spanning_tree),
+            set(MinimumSpanningTreeFinder(points).minimum_spanning_tree),
+        )
+
+    def test_delaunay_kruskal_matches_prim_total_weight(self):
+        for i in range(50):
+            points = [
+                (np.random.randint(0, 100), np.random.randint(0, 100))
+                for _ in range(np.random.randint(3, 100))
+            ]
+            points = list(set(points))
+            prim = MinimumSpanningTreeFinder(points)
+            kruskal = MinimumSpanningTreeFinder(points, algorithm="delaunay_kruskal")
+            weights = prim.compute_weights
+
+            prim_edges = prim.minimum_spanning_tree
+            kruskal_edges = kruskal.minimum_spanning_tree
+            self.assertEqual(len(kruskal_edges), len(points) - 1)
+            self.assertAlmostEqual(
+                sum(weights[u][v] for u, v in kruskal_edges),
+                sum(weights[u][v] for u, v in prim_edges),
+            )
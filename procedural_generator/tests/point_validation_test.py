@@ -0,0 +1,93 @@
+import unittest
+
+import numpy as np
+
+from procedural_generator.minimum_spanning_tree_finder import MinimumSpanningTreeFinder
+from procedural_generator.point_validation import (
+    ValidatedPoints,
+    trusted_points,
+    validate_points,
+)
+from procedural_generator.triangulator import (
+    DelaunayTriangulationAlgorithm,
+    Triangulator,
+)
+
+
+class TestValidatePoints(unittest.TestCase):
+    def test_returns_a_read_only_array(self):
+        validated = validate_points([(0, 0), (1, 0), (0, 1)])
+        self.assertEqual(validated.array.shape, (3, 2))
+        self.assertEqual(len(validated), 3)
+        self.assertEqual(validated.tuples(), [(0, 0), (1, 0), (0, 1)])
+        with self.assertRaises(ValueError):
+            validated.array[0, 0] = 5
+
+    def test_accepts_arrays_and_lists(self):
+        self.assertEqual(len(validate_points(np.array([[0, 0], [1, 0], [0, 1]]))), 3)
+        self.assertEqual(len(validate_points([[0, 0], [1, 0], [0, 1]])), 3)
+
+    def test_raises_type_error_for_malformed_points(self):
+        for points in (
+            [(0, 0), (1, 0), 0],
+            [(0, 0), (1, 0), ("0", 0)],
+            [(0, 0, 0), (1, 0, 0), (0, 1, 0)],
+            [(True, False), (False, True), (True, True)],
+        ):
+            with self.assertRaises(TypeError):
+                validate_points(points)
+
+    def test_raises_value_error_for_bad_point_sets(self):
+        for points, checks in (
+            ([], {}),
+            ([(0, 0), (1, 1)], {}),
+            ([(0, 0), (1, 0), (0, 0)], {}),
+            ([(0, 0), (1, 0), (-1, 0)], {"non_negative": True}),
+            ([(0, 0), (1, 1), (3, 3)], {"non_collinear": True}),
+        ):
+            with self.assertRaises(ValueError):
+                validate_points(points, **checks)
+
+    def test_raises_type_error_for_non_integers_when_asked(self):
+        points = [(0.5, 0), (1, 0), (0, 1)]
+        validate_points(points)
+        with self.assertRaises(TypeError):
+            validate_points(points, integer=True)
+
+    def test_token_records_and_skips_passed_checks(self):
+        validated = validate_points([(0, 0), (1, 0), (0, 1)], non_negative=True)
+        self.assertTrue(validated.non_negative)
+        self.assertFalse(validated.non_collinear)
+        validated = validate_points(validated, non_collinear=True)
+        self.assertTrue(validated.non_negative and validated.non_collinear)
+
+        # A check the token claims to have passed is not run again
+        claimed = ValidatedPoints(
+            np.array([[0, 0], [1, 1], [2, 2]]), non_collinear=True
+        )
+        self.assertIs(validate_points(claimed, non_collinear=True).array, claimed.array)
+
+    def test_trusted_points_are_not_checked(self):
+        points = [(0, 0), (2, 0), (0, -2)]
+        with self.assertRaises(ValueError):
+            Triangulator(points, DelaunayTriangulationAlgorithm())
+        triangulator = Triangulator(
+            points, DelaunayTriangulationAlgorithm(), trusted=True
+        )
+        self.assertEqual(len(triangulator.edges), 3)
+        self.assertTrue(trusted_points(points).non_negative)
+
+    def test_pipeline_accepts_a_token(self):
+        rng = np.random.default_rng(5)
+        points = validate_points(np.unique(rng.integers(0, 100, (60, 2)), axis=0))
+        token_mst = MinimumSpanningTreeFinder(points, algorithm="delaunay_kruskal")
+        tuple_mst = MinimumSpanningTreeFinder(
+            points.tuples(), algorithm="delaunay_kruskal"
+        )
+        self.assertEqual(
+            token_mst.minimum_spanning_tree, tuple_mst.minimum_spanning_tree
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from console_game_engine import entity_factories
+from console_game_engine.game_map import GameMap
+from procedural_generator.generation_strategies import carve_rooms_and_tunnels
+from procedural_generator.room_generation import RectangularRoom, RoomGenerator, RoomSet
+from procedural_generator.spawn_planner import SpawnTable, plan_spawns
+
+
+@pytest.fixture
+def dungeon():
+    game_map = GameMap(60, 40)
+    rooms = RoomGenerator(rng=2).generate_rooms(60, 40, 20, 4, 9, 30, 20)
+    carve_rooms_and_tunnels(game_map, rooms, RoomSet.empty())
+    player = entity_factories.player.spawn(game_map, 30, 20)
+    return game_map, rooms, player
+
+
+def test_spawns_are_on_free_floor_inside_their_rooms(dungeon):
+    game_map, rooms, player = dungeon
+    plan = plan_spawns(game_map, rooms, 3, rng=5)
+    assert len(plan) > 0
+    assert game_map.tiles["walkable"][plan.x, plan.y].all()
+    for x, y, room_index in zip(plan.x, plan.y, plan.rooms):
+        room = rooms[room_index]
+        assert room.x1 < x < room.x2 and room.y1 < y < room.y2
+        assert (x, y) != (player.transform.x, player.transform.y)
+
+
+def test_spawns_never_stack(dungeon):
+    game_map, rooms, _ = dungeon
+    plan = plan_spawns(game_map, rooms, 50, rng=1)
+    cells = set(zip(plan.x.tolist(), plan.y.tolist()))
+    assert len(cells) == len(plan)
+
+
+def test_spawn_counts_respect_the_room_limit_and_skip_the_spawn_room(dungeon):
+    game_map, rooms, _ = dungeon
+    plan = plan_spawns(game_map, rooms, 2, rng=9)
+    counts = np.bincount(plan.rooms, minlength=len(rooms))
+    assert counts.max() <= 2
+    assert counts[0] == 0
+
+
+def test_full_rooms_get_one_spawn_per_free_cell():
+    game_map = GameMap(10, 10)
+    rooms = RoomSet.from_rooms([RectangularRoom(1, 1, 3, 3)])
+    carve_rooms_and_tunnels(game_map, rooms, RoomSet.empty())
+    occupied = np.zeros((10, 10), dtype=bool)
+    occupied[2, 2] = True
+    plan = plan_spawns(game_map, rooms, 10, rng=0, occupied=occupied)
+    assert sorted(zip(plan.x.tolist(), plan.y.tolist())) == [(2, 3), (3, 2), (3, 3)]
+
+
+def test_kinds_follow_the_spawn_table(dungeon):
+    game_map, rooms, _ = dungeon
+    plan = plan_spawns(
+        game_map, rooms, 50, rng=4, table=SpawnTable(("Orc", "Troll"), (1, 0))
+    )
+    assert set(plan.names) == {"Orc"}
+    with pytest.raises(ValueError):
+        SpawnTable(("Orc",), (1, 2))
+
+
+def test_same_seed_same_plan(dungeon):
+    game_map, rooms, _ = dungeon
+    first = plan_spawns(game_map, rooms, 3, rng=7)
+    second = plan_spawns(game_map, rooms, 3, rng=7)
+    assert (first.x == second.x).all() and (first.y == second.y).all()
+    assert (first.kinds == second.kinds).all()
+
+
+def test_materialize_spawns_entities_into_the_map(dungeon):
+    game_map, rooms, _ = dungeon
+    plan = plan_spawns(game_map, rooms, 3, rng=3)
+    monsters = plan.materialize(game_map)
+    assert [monster.name for monster in monsters] == plan.names
+    assert all(monster in game_map.entities for monster in monsters)
+    assert [(m.transform.x, m.transform.y) for m in monsters] == list(
+        zip(plan.x.tolist(), plan.y.tolist())
+    )
@@ -1,4 +1,11 @@
-from procedural_generator.room_generation import RectangularRoom, RoomGenerator
+import numpy as np
+
+from procedural_generator.room_generation import (
+    OccupancyGrid,
+    RectangularRoom,
+    RoomGenerator,
+    RoomSet,
+)
 
 
 def test_rectangular_room_center():
@@ -43,10 +50,137 @@ def test_room_generator_generate_rooms():
 
 def test_room_generator_generate_tunnels():
     generator = RoomGenerator()
-    rooms = [
-        RectangularRoom(x=1, y=1, width=3, height=3),
-        RectangularRoom(x=6, y=6, width=3, height=3),
-        RectangularRoom(x=3, y=3, width=3, height=3),
-    ]
+    rooms = RoomSet.from_rooms(
+        [
+            RectangularRoom(x=1, y=1, width=3, height=3),
+            RectangularRoom(x=6, y=6, width=3, height=3),
+            RectangularRoom(x=3, y=3, width=3, height=3),
+        ]
+    )
     tunnels = generator.generate_tunnels(tunnel_width=1, rooms=rooms)
     assert len(tunnels) == (len(rooms) - 1) * 2  # 2 tunnel between each room
+    expected = [
+        tunnel
+        for room1, room2 in zip(rooms, rooms[1:])
+        for tunnel in generator.create_horizontal_and_verticle_tunnel(room1, room2)
+    ]
+    assert [str(tunnel) for tunnel in tunnels] == [str(tunnel) for tunnel in expected]
+
+
+def test_occupancy_grid_agrees_with_intersects():
+    grid = OccupancyGrid(30, 30)
+    placed = RectangularRoom(x=10, y=10, width=5, height=4)
+    grid.mark(placed)
+    for x in range(0, 20):
+        for y in range(0, 20):
+            candidate = RectangularRoom(x=x, y=y, width=3, height=3)
+            assert grid.is_free(candidate) == (not placed.intersects(candidate))
+
+
+def test_occupancy_grid_clips_rooms_to_the_map():
+    grid = OccupancyGrid(10, 10)
+    grid.mark(RectangularRoom(x=-3, y=-3, width=6, height=6))
+    assert grid.mask[0:4, 0:4].all()
+    assert grid.mask.sum() == 16
+    assert not grid.is_free(RectangularRoom(x=3, y=3, width=2, height=2))
+    assert grid.is_free(RectangularRoom(x=4, y=4, width=2, height=2))
+
+
+def test_occupancy_grid_open_positions():
+    grid = OccupancyGrid(20, 20, footprint=(3, 3))
+    grid.mark(RectangularRoom(x=5, y=5, width=4, height=4))
+    for x in range(20):
+        for y in range(20):
+            room = RectangularRoom(x, y, 3, 3)
+            fits_on_map = room.x2 < 20 and room.y2 < 20
+            assert grid.open_positions[x, y] == (fits_on_map and grid.is_free(room))
+
+
+def test_room_generator_generate_rooms_without_intersections():
+    generator = RoomGenerator()
+    for sample_free_positions in (False, True):
+        rooms = generator.generate_rooms(
+            map_width=80,
+            map_height=40,
+            max_rooms=50,
+            room_min_size=3,
+            room_max_size=8,
+            spawn_x=40,
+            spawn_y=20,
+            sample_free_positions=sample_free_positions,
+        )
+        for i, room in enumerate(rooms):
+            for other in rooms[i + 1 :]:
+                assert not room.intersects(other)
+
+
+def test_room_generator_sampling_free_positions_never_wastes_attempts():
+    for seed in range(10):
+        generator = RoomGenerator(rng=seed)
+        rooms = generator.generate_rooms(
+            80, 40, 8, 3, 8, 40, 20, sample_free_positions=True
+        )
+        assert len(rooms) == 9
+
+
+def test_room_generator_is_reproducible_from_a_seed():
+    for sample_free_positions in (False, True):
+        rooms_a = RoomGenerator(rng=42).generate_rooms(
+            80, 40, 30, 3, 8, 40, 20, sample_free_positions
+        )
+        rooms_b = RoomGenerator(rng=42).generate_rooms(
+            80, 40, 30, 3, 8, 40, 20, sample_free_positions
+        )
+        assert [str(room) for room in rooms_a] == [str(room) for room in rooms_b]
+
+
+def test_room_set_round_trips_rooms():
+    rooms = [
+        RectangularRoom(x=1, y=2, width=3, height=4, type="Spawn_Room"),
+        RectangularRoom(x=-3, y=5, width=6, height=2),
+    ]
+    room_set = RoomSet.from_rooms(rooms)
+    assert len(room_set) == 2
+    assert [str(room) for room in room_set.to_rooms()] == [str(room) for room in rooms]
+    assert room_set.center_points == [room.center for room in rooms]
+
+
+def test_room_set_masks_match_room_slices():
+    rooms = [
+        RectangularRoom(x=1, y=1, width=4, height=3),
+        RectangularRoom(x=6, y=2, width=3, height=5),
+    ]
+    room_set = RoomSet.from_rooms(rooms)
+    for slice_type in ("inner", "outer"):
+        expected = np.zeros((12, 10), dtype=bool)
+        for room in rooms:
+            expected[getattr(room, slice_type)] = True
+        assert (room_set.mask(12, 10, slice_type) == expected).all()
+
+
+def test_room_set_intersections_agree_with_intersects():
+    rooms = RoomGenerator(rng=3).generate_rooms(40, 40, 25, 3, 12, 20, 20).to_rooms()
+    rooms += [RectangularRoom(x=5, y=5, width=8, height=8)]
+    room_set = RoomSet.from_rooms(rooms)
+
+    expected = np.array([[a.intersects(b) for b in rooms] for a in rooms])
+    assert (room_set.pairwise_intersections() == expected).all()
+    assert (room_set.intersects(rooms[-1]) == expected[-1]).all()
+    for i, j in room_set.intersecting_pairs().tolist():
+        assert i < j and expected[i, j]
+
+
+def test_room_sets_concatenate_and_select():
+    first = RoomSet.from_rooms([RectangularRoom(1, 1, 3, 3, "Spawn_Room")])
+    second = RoomSet.from_rooms(
+        [RectangularRoom(6, 6, 4, 2), RectangularRoom(2, 8, 5, 5, "Basic_Room")]
+    )
+    rooms = RoomSet.concatenate([first, RoomSet.empty(), second])
+    assert len(rooms) == 3
+    assert rooms.room_types.tolist() == ["Spawn_Room", "default", "Basic_Room"]
+    assert str(rooms[1]) == str(second[0])
+    assert rooms[1:].x1.tolist() == [6, 2]
+    assert rooms[np.array([True, False, True])].room_types.tolist() == [
+        "Spawn_Room",
+        "Basic_Room",
+    ]
@@ -0,0 +1,105 @@
+import unittest
+
+import numpy as np
+
+from console_game_engine import tile_types
+from procedural_generator.wave_function_collapse import (
+    DIRECTIONS,
+    OverlappingModel,
+    WaveFunctionCollapse,
+    wave_function_collapse,
+)
+
+
+class TestWaveFunctionCollapse(unittest.TestCase):
+    def test_checkerboard_rules_produce_a_checkerboard(self):
+        # Two tiles that may only sit next to the other one
+        compatibility = np.array([[[False, True], [True, False]]] * len(DIRECTIONS))
+        chosen = WaveFunctionCollapse([1, 1], compatibility).solve(9, 7, rng=0)
+        x, y = np.indices((9, 7))
+        self.assertTrue(
+            ((chosen == (x + y) % 2).all()) or ((chosen == (x + y + 1) % 2).all())
+        )
+
+    def test_impossible_rules_raise(self):
+        compatibility = np.zeros((len(DIRECTIONS), 2, 2), dtype=bool)
+        solver = WaveFunctionCollapse([1, 1], compatibility)
+        with self.assertRaises(RuntimeError):
+            solver.solve(4, 4, rng=0, attempts=3)
+
+    def test_more_patterns_than_fit_in_a_machine_word(self):
+        # 70 patterns, each of which may only sit next to itself or the next one
+        num_patterns = 70
+        rules = np.eye(num_patterns, dtype=bool) | np.eye(num_patterns, k=1, dtype=bool)
+        compatibility = np.array([rules, rules, rules.T, rules.T])
+        chosen = WaveFunctionCollapse(np.ones(num_patterns), compatibility).solve(
+            12, 9, rng=3
+        )
+        self.assertEqual(chosen.shape, (12, 9))
+        self.assertTrue(
+            ((np.diff(chosen, axis=0) == 0) | (np.diff(chosen, axis=0) == 1)).all()
+        )
+        self.assertTrue(
+            ((np.diff(chosen, axis=1) == 0) | (np.diff(chosen, axis=1) == 1)).all()
+        )
+
+    def test_batched_collapses_agree_on_every_neighbor(self):
+        # Large enough that collapsing many cells at once runs into
+        # contradictions that have to be rolled back
+        solver = OverlappingModel.from_strings().solver
+        chosen = solver.solve(120, 90, rng=1)
+        for direction, (dx, dy) in enumerate(DIRECTIONS):
+            here = chosen[max(0, -dx) : 120 - max(0, dx), max(0, -dy) : 90 - max(0, dy)]
+            there = chosen[max(0, dx) : 120 + min(0, dx), max(0, dy) : 90 + min(0, dy)]
+            self.assertTrue(solver.compatibility[direction, here, there].all())
+
+
+class TestOverlappingModel(unittest.TestCase):
+    def setUp(self):
+        self.model = OverlappingModel.from_strings()
+
+    def test_compatibility_is_symmetric(self):
+        solver = self.model.solver
+        for direction in range(len(DIRECTIONS)):
+            opposite = (direction + 2) % len(DIRECTIONS)
+            for p in range(solver.num_patterns):
+                for q in range(solver.num_patterns):
+                    self.assertEqual(
+                        solver.compatibility[direction, p, q],
+                        solver.compatibility[opposite, q, p],
+                    )
+
+    def test_every_window_of_the_output_is_a_pattern(self):
+        output = self.model.generate(30, 20, rng=4)
+        self.assertEqual(output.shape, (30, 20))
+        patterns = {pattern.tobytes() for pattern in self.model.patterns}
+        n = self.model.pattern_size
+        for x in range(30 - n + 1):
+            for y in range(20 - n + 1):
+                self.assertIn(output[x : x + n, y : y + n].tobytes(), patterns)
+
+    def test_symmetry_8_on_the_default_sample(self):
+        model = OverlappingModel.from_strings(symmetry=8)
+        self.assertGreater(len(model.patterns), 64)
+        output = model.generate(30, 20, rng=5)
+        patterns = {pattern.tobytes() for pattern in model.patterns}
+        n = model.pattern_size
+        for x in range(30 - n + 1):
+            for y in range(20 - n + 1):
+                self.assertIn(output[x : x + n, y : y + n].tobytes(), patterns)
+
+    def test_same_seed_same_output(self):
+        first = self.model.generate(25, 15, rng=11)
+        second = self.model.generate(25, 15, rng=11)
+        self.assertTrue((first == second).all())
+
+    def test_wave_function_collapse_returns_game_map_tiles(self):
+        tiles = wave_function_collapse(x=40, y=20, rng=2)
+        self.assertEqual(tiles.shape, (40, 20))
+        self.assertEqual(tiles.dtype, tile_types.tile_dt)
+        self.assertTrue((tiles["walkable"]).any())
+        self.assertFalse((tiles["walkable"]).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
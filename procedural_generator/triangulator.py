@@ -1,72 +1,94 @@
+import numpy as np
 from scipy.spatial import Delaunay
 from abc import ABC, abstractmethod
 
+from procedural_generator.point_validation import (
+    ValidatedPoints,
+    trusted_points,
+    validate_points,
+)
+
 
 class TriangulationAlgorithm(ABC):
     @abstractmethod
     def compute_edges(self, points: list[tuple[int, int]]) -> set[tuple[int, int]]:
         ...  # pragma: no cover
 
+    def compute_edge_array(self, points: list[tuple[int, int]]) -> np.ndarray:
+        # (E, 2) int array of the edges; algorithms can override this with
+        # something faster than going through the set of tuples
+        edges = sorted(self.compute_edges(points))
+        return np.array(edges, dtype=np.int64).reshape(-1, 2)
+
 
 class DelaunayTriangulationAlgorithm(TriangulationAlgorithm):
     def compute_edges(self, points: list[tuple[int, int]]) -> set[tuple[int, int]]:
-        tri = Delaunay(points)
-        edges = set()
-        for simplex in tri.simplices:
-            for i in range(3):
-                for j in range(i + 1, 3):
-                    edges.add((simplex[i], simplex[j]))
-        return edges
+        return set(map(tuple, self.compute_edge_array(points).tolist()))
+
+    def compute_edge_array(self, points: list[tuple[int, int]]) -> np.ndarray:
+        simplices = Delaunay(points).simplices.astype(np.int64)
+        # The three sides of every triangle, each shared side appearing twice
+        pairs = simplices[:, [0, 1, 0, 2, 1, 2]].reshape(-1, 2)
+        # Deduplicate on the unordered pair, keeping the first orientation seen.
+        # The result comes out ordered by (smaller index, larger index).
+        low = np.minimum(pairs[:, 0], pairs[:, 1])
+        high = np.maximum(pairs[:, 0], pairs[:, 1])
+        _, first = np.unique(low * len(points) + high, return_index=True)
+        return pairs[first]
 
 
 class Triangulator:
     def __init__(
-        self, points: list[tuple[int, int]], algorithm: TriangulationAlgorithm
+        self,
+        points: list[tuple[int, int]],
+        algorithm: TriangulationAlgorithm,
+        trusted: bool = False,
     ) -> None:
-        self._validate_inputs(points)
-        self.points = points
+        # A ValidatedPoints token only has the checks it has not passed run,
+        # and trusted points skip validation altogether
+        self.validated_points = (
+            trusted_points(points) if trusted else self._validate_inputs(points)
+        )
+        self.points = points.array if isinstance(points, ValidatedPoints) else points
         self.algorithm = algorithm
 
+    @property
+    def edges(self) -> np.ndarray:
+        # (E, 2) int array of point indices, one row per edge
+        if not hasattr(self, "_edge_array"):
+            self._edge_array = self.algorithm.compute_edge_array(self.points)
+        return self._edge_array
+
     @property
     def triangulation(self) -> list[tuple[int, int]]:
         if not hasattr(self, "_triangulation"):
-            self._triangulation = self.algorithm.compute_edges(self.points)
+            self._triangulation = list(map(tuple, self.edges.tolist()))
         return self._triangulation
 
     @property
-    def sorted_edges(self):
+    def sorted_edge_array(self) -> np.ndarray:
+        if not hasattr(self, "_sorted_edge_array"):
+            self._sorted_edge_array = self._sort_edges()
+        return self._sorted_edge_array
+
+    @property
+    def sorted_edges(self) -> list[tuple[int, int]]:
         if not hasattr(self, "_edges"):
-            self._edges = self._sort_edges()
+            self._edges = list(map(tuple, self.sorted_edge_array.tolist()))
         return self._edges
 
-    def _sort_edges(self):
-        # Define a key function that returns a tuple of the two points in the edge sorted by x and y
-        def key_function(edge):
-            x1, y1 = self.points[edge[0]]
-            x2, y2 = self.points[edge[1]]
-            if x1 < x2 or (x1 == x2 and y1 < y2):
-                return (x1, y1, x2, y2)
-            else:
-                return (x2, y2, x1, y1)
-
-        # Sort the edges using the key function and return them as a list
-        sorted_edges = sorted(self.triangulation, key=key_function)
-        return list(sorted_edges)
+    def _sort_edges(self) -> np.ndarray:
+        # Sorts the edges by their two points, the smaller by x then y first
+        points = np.asarray(self.points)
+        a, b = points[self.edges[:, 0]], points[self.edges[:, 1]]
+        swap = (a[:, 0] > b[:, 0]) | ((a[:, 0] == b[:, 0]) & (a[:, 1] > b[:, 1]))
+        low = np.where(swap[:, None], b, a)
+        high = np.where(swap[:, None], a, b)
+        # lexsort sorts by the last key first
+        order = np.lexsort((high[:, 1], high[:, 0], low[:, 1], low[:, 0]))
+        return self.edges[order]
 
-    def _validate_inputs(self, points):
-        if not all(isinstance(p, tuple) for p in points):
-            raise TypeError("Points must be tuples.")
-        if not all(isinstance(p[0], int) and isinstance(p[1], int) for p in points):
-            raise TypeError("Points must be integers.")
-        if len(points) < 3:
-            raise ValueError("Not enough points to construct a Delaunay triangulation.")
-        if len(set(points)) != len(points):
-            raise ValueError("Duplicate points are not allowed.")
-        if not all(p[0] >= 0 and p[1] >= 0 for p in points):
-            raise ValueError("Points must be non-negative.")
-        # checks to make sure points are not in a line
-        if (
-            len(set([p[0] for p in points])) == 1
-            or len(set([p[1] for p in points])) == 1
-        ):
-            raise ValueError("Points must not be in a line.")
+    def _validate_inputs(self, points) -> ValidatedPoints:
+        return validate_points(
+            points, integer=True, non_negative=True, non_collinear=True
+        )